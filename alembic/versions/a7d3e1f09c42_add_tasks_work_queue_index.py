@@ -0,0 +1,32 @@
+"""add_tasks_work_queue_index
+
+Revision ID: a7d3e1f09c42
+Revises: c4e9a2f7b813
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e1f09c42'
+down_revision: Union[str, Sequence[str], None] = 'c4e9a2f7b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite index for the director's active-task queries."""
+    op.create_index(
+        "ix_tasks_project_status_stage_priority",
+        "tasks",
+        ["project_id", "status", "pipeline_stage", "priority"],
+    )
+
+
+def downgrade() -> None:
+    """Drop director active-task index."""
+    op.drop_index("ix_tasks_project_status_stage_priority", table_name="tasks")
@@ -0,0 +1,39 @@
+"""add_deployment_history_lookup_indexes
+
+Revision ID: c4e9a2f7b813
+Revises: 359e870dd8a0
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a2f7b813'
+down_revision: Union[str, Sequence[str], None] = '359e870dd8a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite indexes for latest/previous deployment lookups."""
+    op.create_index(
+        "ix_dh_env_status_completed",
+        "deployment_history",
+        ["environment_id", "status", sa.text("completed_at DESC")],
+    )
+    op.create_index(
+        "ix_dh_env_id_desc",
+        "deployment_history",
+        ["environment_id", sa.text("id DESC")],
+        postgresql_where=sa.text("status = 'DEPLOYED'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop deployment history lookup indexes."""
+    op.drop_index("ix_dh_env_id_desc", table_name="deployment_history")
+    op.drop_index("ix_dh_env_status_completed", table_name="deployment_history")
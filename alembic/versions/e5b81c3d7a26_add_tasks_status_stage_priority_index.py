@@ -0,0 +1,32 @@
+"""add_tasks_status_stage_priority_index
+
+Revision ID: e5b81c3d7a26
+Revises: a7d3e1f09c42
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b81c3d7a26'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e1f09c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite index for the orchestrator's cross-project task picks."""
+    op.create_index(
+        "ix_tasks_status_stage_priority_id",
+        "tasks",
+        ["status", "pipeline_stage", "priority", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop orchestrator task pick index."""
+    op.drop_index("ix_tasks_status_stage_priority_id", table_name="tasks")
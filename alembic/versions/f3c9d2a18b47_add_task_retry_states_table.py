@@ -0,0 +1,34 @@
+"""add_task_retry_states_table
+
+Revision ID: f3c9d2a18b47
+Revises: e5b81c3d7a26
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d2a18b47'
+down_revision: Union[str, Sequence[str], None] = 'e5b81c3d7a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add table for the orchestrator's persisted retry counters."""
+    op.create_table('task_retry_states',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_attempt', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+
+
+def downgrade() -> None:
+    """Drop task retry state table."""
+    op.drop_table('task_retry_states')
@@ -1,5 +1,7 @@
 """Audit event model."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+import atexit
+import threading
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, insert
 from sqlalchemy.sql import func
 from app.db import Base
 
@@ -28,8 +30,13 @@ class AuditEvent(Base):
         }
 
 
-def log_event(db, actor: str, action: str, entity_type: str, entity_id: int = None, details: dict = None):
-    """Helper to create audit log entry."""
+def log_event(db, actor: str, action: str, entity_type: str, entity_id: int = None, details: dict = None,
+              commit: bool = True):
+    """Helper to create audit log entry.
+
+    Pass commit=False to add the entry to the caller's transaction instead
+    of committing immediately.
+    """
     event = AuditEvent(
         actor=actor,
         action=action,
@@ -38,5 +45,79 @@ def log_event(db, actor: str, action: str, entity_type: str, entity_id: int = No
         details=details,
     )
     db.add(event)
-    db.commit()
+    if commit:
+        db.commit()
     return event
+
+
+class AuditBuffer:
+    """Collects audit events and writes them in batches.
+
+    For events about work that is already committed (e.g. an agent job that
+    was submitted); events describing a pending change go through
+    log_event(commit=False) so they commit or roll back with it. Callers
+    flush() at the end of a batch; pending events are also written once
+    MAX_PENDING are waiting, with one multi-row INSERT in a separate session.
+    Rows from a failed write stay queued for the next flush.
+    """
+
+    MAX_PENDING = 50
+    # Oldest rows are dropped past this while the database stays unavailable
+    MAX_RETAINED = 1000
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._exit_hook = False
+
+    def add(self, actor: str, action: str, entity_type: str, entity_id: int = None, details: dict = None):
+        """Queue an audit entry; same fields as log_event()."""
+        with self._lock:
+            self._pending.append({
+                "actor": actor,
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "details": details,
+            })
+            full = len(self._pending) >= self.MAX_PENDING
+            if not self._exit_hook:
+                atexit.register(self.flush)
+                self._exit_hook = True
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending events now. Returns the number written."""
+        with self._write_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+
+            if self._session_factory is None:
+                from app.db import SessionLocal
+                self._session_factory = SessionLocal
+
+            db = self._session_factory()
+            try:
+                db.execute(insert(AuditEvent), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                with self._lock:
+                    self._pending[:0] = rows
+                    dropped = len(self._pending) - self.MAX_RETAINED
+                    if dropped > 0:
+                        del self._pending[:dropped]
+                print(f"[Audit] Failed to write {len(rows)} events, kept for retry: {e}")
+                return 0
+            finally:
+                db.close()
+            return len(rows)
+
+
+# Shared buffer for events about already-committed work on hot paths
+audit_buffer = AuditBuffer()
@@ -1,7 +1,7 @@
 """Deployment history model for tracking deployments and enabling rollback."""
 import enum
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean, JSON, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -63,6 +63,16 @@ class DeploymentHistory(Base):
     run = relationship("Run", backref="deployments")
     environment = relationship("Environment", backref="deployments")
 
+    __table_args__ = (
+        # get_latest_deployment / get_previous_deployment: filter env+status, newest first
+        Index("ix_dh_env_status_completed", environment_id, status, completed_at.desc()),
+        # get_previous_deployment: id < X among DEPLOYED rows for an environment
+        Index(
+            "ix_dh_env_id_desc", environment_id, id.desc(),
+            postgresql_where=text("status = 'DEPLOYED'"),
+        ),
+    )
+
     def to_dict(self):
         """Convert to dictionary representation."""
         return {
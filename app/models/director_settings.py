@@ -15,7 +15,8 @@ class DirectorSettings(Base):
     Settings are loaded on startup and updated via API.
 
     Attributes:
-        enabled: Whether Director should auto-start on server boot
+        enabled: Whether Director should auto-start on server boot; a running
+            daemon pauses orchestration while this is false
         poll_interval: Seconds between Director poll cycles
         enforce_tdd: Require tests before advancing past QA
         enforce_dry: Check for code duplication
@@ -71,13 +72,19 @@ class DirectorSettings(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
 
+    def paused_poll_interval(self):
+        """Seconds between heartbeats while the daemon is paused (enabled=False)."""
+        return max(self.poll_interval * 4, 60)
+
     def is_daemon_running(self):
         """Check if daemon is running based on heartbeat timestamp."""
         import datetime
         if not self.daemon_started_at:
             return False
         # Consider daemon running if heartbeat is within last 2x poll interval
-        max_age = self.poll_interval * 2
+        # (a paused daemon heartbeats less often)
+        interval = self.poll_interval if self.enabled else self.paused_poll_interval()
+        max_age = interval * 2
         elapsed = (datetime.datetime.now(datetime.timezone.utc) - self.daemon_started_at).total_seconds()
         return elapsed < max_age
 
@@ -20,6 +20,7 @@ class JobType(enum.Enum):
     LLM_QUERY = "llm_query"            # Contextual query
     VISION_ANALYZE = "vision_analyze"  # Image analysis
     AGENT_RUN = "agent_run"            # Goose agent execution
+    DEPLOYMENT = "deployment"          # Deploy/rollback execution
 
 
 class JobStatus(enum.Enum):
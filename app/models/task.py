@@ -10,7 +10,7 @@ Pipeline stages (PM, DEV, QA, SEC) are deprecated - claims define validation.
 """
 import enum
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, Session
 from app.db import Base
@@ -107,18 +107,48 @@ class Task(Base):
     subtasks = relationship("Task", back_populates="parent")
     # work_cycles and claims relationships defined via backref
 
+    __table_args__ = (
+        # Director work queue: active tasks for a project by stage/priority
+        Index("ix_tasks_project_status_stage_priority", project_id, status, pipeline_stage, priority),
+        # Orchestrator picks across projects: backlog starts and agent triggers,
+        # ordered by priority with id as tie-breaker
+        Index("ix_tasks_status_stage_priority_id", status, pipeline_stage, priority, id),
+    )
+
     def is_blocked(self, session: Session) -> bool:
         """Check if this task is blocked by incomplete dependencies."""
         if not self.blocked_by:
             return False
 
-        blocking_tasks = session.query(Task).filter(
-            Task.project_id == self.project_id,
-            Task.task_id.in_(self.blocked_by),
-            Task.status != TaskStatus.DONE
-        ).count()
+        # EXISTS stops at the first open dependency instead of counting them all
+        return session.query(
+            session.query(Task.id).filter(
+                Task.project_id == self.project_id,
+                Task.task_id.in_(self.blocked_by),
+                Task.status != TaskStatus.DONE
+            ).exists()
+        ).scalar()
+
+    @classmethod
+    def blocked_ids(cls, session: Session, tasks) -> set:
+        """Return ids of the given tasks that are blocked by incomplete dependencies.
+
+        Batch form of is_blocked(): one query for all dependencies of the batch.
+        """
+        deps = {(task.project_id, dep) for task in tasks for dep in (task.blocked_by or [])}
+        if not deps:
+            return set()
 
-        return blocking_tasks > 0
+        open_deps = set(session.query(cls.project_id, cls.task_id).filter(
+            cls.project_id.in_({project_id for project_id, _ in deps}),
+            cls.task_id.in_({dep for _, dep in deps}),
+            cls.status != TaskStatus.DONE
+        ).all())
+
+        return {
+            task.id for task in tasks
+            if any((task.project_id, dep) in open_deps for dep in (task.blocked_by or []))
+        }
 
     def to_dict(self) -> dict:
         """Serialize task to dictionary."""
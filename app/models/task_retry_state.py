@@ -0,0 +1,27 @@
+"""TaskRetryState model - persists the orchestrator's retry counters.
+
+Stores per-task retry counts in the database so they survive daemon
+restarts; otherwise a task that keeps getting stuck would never reach
+the retry limit and be blocked.
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from app.db import Base
+
+
+class TaskRetryState(Base):
+    """Retry bookkeeping for a stuck task (one row per task).
+
+    Attributes:
+        task_id: Task being retried
+        count: Retries triggered so far
+        last_attempt: When the last retry was triggered (or the task's last
+            activity when first seen)
+    """
+    __tablename__ = "task_retry_states"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+    last_attempt = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<TaskRetryState(task_id={self.task_id}, count={self.count})>"
@@ -0,0 +1,102 @@
+"""Async Artifact Writer - Background writes for non-critical files.
+
+Work cycle markdown files are a backup of context that agents also receive
+in their prompt, so their disk writes are taken off the request path.
+Submitted writes are coalesced per path (latest content wins) and flushed
+by one daemon thread. Database commits stay synchronous in the callers.
+"""
+import atexit
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# How long interpreter shutdown waits for queued writes
+EXIT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+
+class AsyncArtifactWriter:
+    """Writes files in a background thread.
+
+    Each file is written to a temp file and swapped in, so readers never
+    see a partial file, and an unchanged file (and its mtime) is left alone.
+    """
+
+    _instance: Optional['AsyncArtifactWriter'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._pending: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls) -> 'AsyncArtifactWriter':
+        """Get singleton instance."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.flush, EXIT_FLUSH_TIMEOUT_SECONDS)
+            return cls._instance
+
+    def submit(self, path: Union[str, Path], data: bytes):
+        """Queue `data` to be written to `path`, replacing any queued write."""
+        with self._lock:
+            self._pending[str(path)] = data
+            self._idle.clear()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self._run_loop,
+                    name="AsyncArtifactWriter",
+                    daemon=True
+                )
+                self.thread.start()
+        self._wakeup.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued writes are on disk.
+
+        Returns:
+            False if the timeout expired first
+        """
+        return self._idle.wait(timeout)
+
+    def _run_loop(self):
+        """Write queued files until the process exits."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            for path, data in batch.items():
+                self._write(Path(path), data)
+            with self._lock:
+                if not self._pending:
+                    self._idle.set()
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        """Atomically write `data` to `path` unless it already holds it."""
+        try:
+            if path.read_bytes() == data:
+                return
+        except OSError:
+            pass  # Missing or unreadable: write it
+
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write {path}: {e}")
+
+
+def get_async_writer() -> AsyncArtifactWriter:
+    """Get the async artifact writer singleton."""
+    return AsyncArtifactWriter.get_instance()
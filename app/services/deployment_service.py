@@ -1,24 +1,278 @@
 """Deployment service for managing deployments and rollbacks."""
+import asyncio
 import os
+import re
+import shlex
+import signal
 import subprocess
+import threading
+import httpx
 import requests
-from datetime import datetime, timezone
-from typing import Optional, Tuple, List
-from sqlalchemy.orm import Session
+from requests.adapters import HTTPAdapter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Optional, Tuple, List, Union
+from sqlalchemy import insert, text, update
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.run import Run, RunState
 from app.models.project import Project
 from app.models.environment import Environment
 from app.models.deployment_history import DeploymentHistory, DeploymentStatus
-from app.models.audit import log_event
+from app.models.audit import AuditEvent
+from app.services.git_utils import read_git_head
 from app.services.webhook_service import dispatch_webhook, EVENT_STATE_CHANGE
 
+# Worker threads for overlapping independent I/O stages (git, health, tests)
+FLOW_MAX_WORKERS = 4
+
+# First key of the (namespace, environment_id) advisory lock taken by
+# start_deployment; keeps deploy locks apart from other advisory lock users
+DEPLOY_LOCK_NAMESPACE = 4201
+
+# Deploy command timeout; a DEPLOYING record older than this plus the slack
+# (time for the job queue to pick the deploy up) belongs to a worker that
+# crashed or a job that never ran, and no longer blocks the environment.
+# A worker restarts the clock when it claims the record in execute_deployment
+DEPLOY_TIMEOUT_SECONDS = 300
+DEPLOY_STALE_SLACK_SECONDS = 300
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 30
+TEST_TIMEOUT_SECONDS = 600
+
+# Worst case for one queued deploy job: deploy, health check and tests,
+# then the auto-rollback's deploy and health check
+DEPLOY_FLOW_TIMEOUT_SECONDS = (
+    DEPLOY_TIMEOUT_SECONDS + HEALTH_CHECK_TIMEOUT_SECONDS + TEST_TIMEOUT_SECONDS
+    + DEPLOY_TIMEOUT_SECONDS + HEALTH_CHECK_TIMEOUT_SECONDS
+)
+
+
+# Syntax only /bin/sh can interpret: pipes, redirects, chaining, expansion, globbing
+SHELL_SYNTAX_PATTERN = re.compile(r"[|&;<>()$`*?\[\]{}~!#\n]")
+
+# Builtins with no executable on PATH
+SHELL_BUILTINS = frozenset({".", "alias", "cd", "eval", "exec", "exit", "export", "set", "source", "unset"})
+
+# Leading VAR=value assignment, e.g. "DEBUG=1 pytest"
+ENV_ASSIGNMENT_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+@lru_cache(maxsize=256)
+def _parse_command(command: str) -> Tuple[Union[str, Tuple[str, ...]], bool]:
+    """Parse a configured command once into subprocess arguments.
+
+    Plain commands become an argv tuple run with shell=False, which lets
+    subprocess use the posix_spawn fast path instead of forking a shell.
+    Commands that rely on shell syntax or builtins are returned unchanged
+    to run with shell=True.
+
+    Returns (args, use_shell).
+    """
+    if SHELL_SYNTAX_PATTERN.search(command):
+        return command, True
+
+    try:
+        argv = tuple(shlex.split(command))
+    except ValueError:
+        # Unbalanced quotes - let the shell report it
+        return command, True
+
+    if not argv or argv[0] in SHELL_BUILTINS or ENV_ASSIGNMENT_PATTERN.match(argv[0]):
+        return command, True
+
+    return argv, False
+
+
+@lru_cache(maxsize=256)
+def _parse_rollback_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """Parse a rollback command template once into (literal, field) pairs.
+
+    Returns None when a field uses a conversion or format spec, in which
+    case the caller falls back to str.format.
+    """
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if spec or conversion:
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _render_rollback_command(template: str, **values) -> str:
+    """Substitute {commit_sha}/{version}/{previous_sha} into a rollback command."""
+    parts = _parse_rollback_template(template)
+    if parts is None:
+        return template.format(**values)
+    return "".join(
+        literal if field is None else literal + str(values[field])
+        for literal, field in parts
+    )
+
+
+# Full deploy/test command output is written here; rows keep only head and tail
+DEPLOYMENT_LOG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "logs",
+    "deployments"
+)
+
+# Command output kept on the deployment row: first/last N chars of the log
+OUTPUT_HEAD_CHARS = 8192
+OUTPUT_TAIL_CHARS = 16384
+OUTPUT_TRUNCATION_MARKER = "\n...[TRUNCATED {omitted} chars]...\n"
+OUTPUT_DETACHED_MARKER = "\n...[output capture stopped: a background process still holds the pipe]\n"
+
+
+def deployment_log_path(deployment_id: int, stage: str = "deploy") -> str:
+    """Path of the full output log for a deployment stage ("deploy" or "tests")."""
+    return os.path.join(DEPLOYMENT_LOG_DIR, f"deployment_{deployment_id}_{stage}.log")
+
+
+def _cap_output(text: str, head: int = OUTPUT_HEAD_CHARS, tail: int = OUTPUT_TAIL_CHARS) -> str:
+    """Keep the first `head` and last `tail` chars of text, marking the cut."""
+    if len(text) <= head + tail:
+        return text
+    marker = OUTPUT_TRUNCATION_MARKER.format(omitted=len(text) - head - tail)
+    return text[:head] + marker + text[-tail:]
+
+
+def _stream_command(
+    args: Union[str, Tuple[str, ...]],
+    use_shell: bool,
+    cwd: Optional[str],
+    timeout: int,
+    log_path: str
+) -> Tuple[int, str]:
+    """Run a command, streaming merged stdout/stderr to a log file.
+
+    Only the first OUTPUT_HEAD_CHARS and last OUTPUT_TAIL_CHARS of output
+    are held in memory, so usage stays bounded no matter how much the
+    command prints; the full output is in the log file. On timeout the
+    process is killed and TimeoutExpired re-raised. A command that can't be
+    started returns the exit code /bin/sh would: 127 if it is missing, 126
+    if it is not executable.
+
+    Returns (returncode, capped_output).
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    head = []
+    tail = deque()
+    sizes = {"head": 0, "tail": 0, "total": 0}
+
+    with open(log_path, "w") as log_file:
+        try:
+            proc = subprocess.Popen(
+                args,
+                shell=use_shell,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                start_new_session=True
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            message = f"{e}\n"
+            log_file.write(message)
+            return (127 if isinstance(e, FileNotFoundError) else 126), message
+
+        # Guards the log file and buffers; `stopped` ends capture early
+        lock = threading.Lock()
+        state = {"stopped": False}
+
+        def pump():
+            try:
+                for line in proc.stdout:
+                    with lock:
+                        if state["stopped"]:
+                            break
+                        log_file.write(line)
+                        sizes["total"] += len(line)
+                        if sizes["head"] < OUTPUT_HEAD_CHARS:
+                            head.append(line)
+                            sizes["head"] += len(line)
+                            continue
+                        tail.append(line)
+                        sizes["tail"] += len(line)
+                        # Drop whole lines while the rest still covers the tail budget
+                        while len(tail) > 1 and sizes["tail"] - len(tail[0]) >= OUTPUT_TAIL_CHARS:
+                            sizes["tail"] -= len(tail.popleft())
+            finally:
+                proc.stdout.close()
+
+        # Read on a separate thread so wait() can enforce the timeout
+        reader = threading.Thread(target=pump, daemon=True)
+        reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Kill the whole group so shell children release the pipe too
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass  # Group already gone
+            proc.wait()
+            raise
+        finally:
+            reader.join(timeout=5)
+            # A backgrounded child (e.g. `nohup ./server &`) can keep the pipe
+            # open after the command exits; stop capturing instead of waiting
+            with lock:
+                state["stopped"] = True
+                detached = reader.is_alive()
+                head_text = "".join(head)[:OUTPUT_HEAD_CHARS]
+                tail_text = "".join(tail)[-OUTPUT_TAIL_CHARS:]
+                total = sizes["total"]
+                if detached:
+                    log_file.write(OUTPUT_DETACHED_MARKER)
+
+    if detached:
+        tail_text += OUTPUT_DETACHED_MARKER
+        total += len(OUTPUT_DETACHED_MARKER)
+    omitted = total - len(head_text) - len(tail_text)
+    if omitted > 0:
+        return proc.returncode, head_text + OUTPUT_TRUNCATION_MARKER.format(omitted=omitted) + tail_text
+    return proc.returncode, head_text + tail_text
+
+
+def _build_http_session() -> requests.Session:
+    """Build a pooled keep-alive HTTP session for health checks."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class DeploymentService:
     """Service for managing deployments, health checks, and rollbacks."""
 
+    # Shared across instances so repeated checks reuse TCP/TLS connections
+    _http = _build_http_session()
+
     def __init__(self, db: Session):
         self.db = db
+        # Lookup caches scoped to this instance (one service per request/flow)
+        self._env_cache: Dict[int, Environment] = {}
+        # Audit events pending for the current transaction
+        self._audit_buf: List[dict] = []
+
+    def _get_environment_cached(self, environment_id: int) -> Optional[Environment]:
+        """Get an environment by ID, querying at most once per service instance."""
+        if environment_id not in self._env_cache:
+            environment = self.db.query(Environment).filter(Environment.id == environment_id).first()
+            if not environment:
+                return None
+            self._env_cache[environment_id] = environment
+        return self._env_cache[environment_id]
 
     def get_environment(self, project_id: int) -> Optional[Environment]:
         """Get the active environment for a project."""
@@ -60,6 +314,125 @@ class DeploymentService:
             .first()
         )
 
+    def _get_deployment_context(
+        self, deployment_id: int
+    ) -> Optional[Tuple[DeploymentHistory, Optional[Environment], Optional[Run], Optional[Project]]]:
+        """Load a deployment with its environment, run, and project in one query.
+
+        Returns (deployment, environment, run, project), or None if the
+        deployment does not exist. Missing related rows come back as None.
+        """
+        row = (
+            self.db.query(DeploymentHistory, Environment, Run, Project)
+            .outerjoin(Environment, Environment.id == DeploymentHistory.environment_id)
+            .outerjoin(Run, Run.id == DeploymentHistory.run_id)
+            .outerjoin(Project, Project.id == Run.project_id)
+            .filter(DeploymentHistory.id == deployment_id)
+            .first()
+        )
+        if not row:
+            return None
+
+        deployment, environment, run, project = row
+        if environment:
+            self._env_cache[environment.id] = environment
+        return deployment, environment, run, project
+
+    def _lock_environment(self, environment_id: int) -> bool:
+        """Take the per-environment deploy lock for the current transaction.
+
+        Uses a non-blocking Postgres advisory lock so a concurrent
+        start_deployment for the same environment fails fast instead of
+        waiting. The lock is released on commit/rollback. Other databases
+        have no advisory locks and always succeed.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:namespace, :environment_id)"),
+            {"namespace": DEPLOY_LOCK_NAMESPACE, "environment_id": environment_id}
+        ).scalar())
+
+    def _fail_stale_deployments(self, environment_id: int) -> List[int]:
+        """Mark DEPLOYING records past the deploy timeout plus slack FAILED.
+
+        Returns the ids of the records that were marked.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            seconds=DEPLOY_TIMEOUT_SECONDS + DEPLOY_STALE_SLACK_SECONDS
+        )
+        return list(self.db.execute(
+            update(DeploymentHistory)
+            .where(
+                DeploymentHistory.environment_id == environment_id,
+                DeploymentHistory.status == DeploymentStatus.DEPLOYING,
+                DeploymentHistory.started_at < cutoff
+            )
+            .values(
+                status=DeploymentStatus.FAILED,
+                completed_at=datetime.now(timezone.utc),
+                deploy_output="Deployment never finished (worker lost or job not run)"
+            )
+            .returning(DeploymentHistory.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+
+    def _claim_deployment(self, deployment_id: int) -> bool:
+        """Claim a DEPLOYING record for execution and restart its stale clock.
+
+        The conditional UPDATE loses to a concurrent _fail_stale_deployments,
+        so a record already marked FAILED is never run. Commits the claim.
+        """
+        claimed = self.db.execute(
+            update(DeploymentHistory)
+            .where(
+                DeploymentHistory.id == deployment_id,
+                DeploymentHistory.status == DeploymentStatus.DEPLOYING
+            )
+            .values(started_at=datetime.now(timezone.utc))
+            .returning(DeploymentHistory.id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        self._commit()
+        return claimed is not None
+
+    def _has_deployment_in_progress(self, environment_id: int) -> bool:
+        """Check whether the environment already has a DEPLOYING record."""
+        return self.db.query(
+            self.db.query(DeploymentHistory.id).filter(
+                DeploymentHistory.environment_id == environment_id,
+                DeploymentHistory.status == DeploymentStatus.DEPLOYING
+            ).exists()
+        ).scalar()
+
+    def _reserve_environment(self, environment_id: int) -> Optional[str]:
+        """Take the deploy lock and check nothing is deploying to the environment.
+
+        Stale DEPLOYING records are failed first. Keeps at most one DEPLOYING
+        record per environment, so queued jobs for different environments can
+        run in parallel. Returns an error message, or None when the caller
+        may insert its DEPLOYING record and commit.
+        """
+        # Refusals roll back so the advisory lock and transaction are released
+        if not self._lock_environment(environment_id):
+            self.db.rollback()
+            return "A deployment to this environment is already starting"
+
+        for stale_id in self._fail_stale_deployments(environment_id):
+            self._audit(
+                actor="system",
+                action="deploy_stale",
+                entity_id=stale_id,
+                details={"environment_id": environment_id}
+            )
+
+        if self._has_deployment_in_progress(environment_id):
+            self.db.rollback()
+            self._audit_buf = []
+            return "A deployment to this environment is already in progress"
+
+        return None
+
     def start_deployment(
         self,
         run_id: int,
@@ -72,45 +445,59 @@ class DeploymentService:
         Creates a deployment history record and initiates deployment.
         Returns (deployment, error_message).
         """
-        run = self.db.query(Run).filter(Run.id == run_id).first()
-        if not run:
+        # Run and its project in one round-trip instead of Run then Project
+        row = (
+            self.db.query(Run, Project)
+            .outerjoin(Project, Project.id == Run.project_id)
+            .filter(Run.id == run_id)
+            .first()
+        )
+        if not row:
             return None, "Run not found"
 
-        environment = self.db.query(Environment).filter(Environment.id == environment_id).first()
-        if not environment:
-            return None, "Environment not found"
-
-        if not environment.deploy_command:
-            return None, "No deploy command configured for environment"
+        run, project = row
 
-        # Get git commit SHA from project repo
-        project = self.db.query(Project).filter(Project.id == run.project_id).first()
-        commit_sha = self._get_current_commit(project.repo_path if project else None)
-
-        # Get previous deployment for rollback reference
-        latest = self.get_latest_deployment(environment_id)
-        previous_sha = latest.commit_sha if latest else None
-
-        # Create deployment record
-        deployment = DeploymentHistory(
-            run_id=run_id,
-            environment_id=environment_id,
-            commit_sha=commit_sha,
-            previous_commit_sha=previous_sha,
-            status=DeploymentStatus.DEPLOYING,
-            deploy_command_used=environment.deploy_command,
-            triggered_by=triggered_by,
-            approved_by=approved_by
-        )
-        self.db.add(deployment)
-        self.db.commit()
-        self.db.refresh(deployment)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Get git commit SHA from project repo while the remaining lookups run
+            commit_future = executor.submit(
+                self._get_current_commit, project.repo_path if project else None
+            )
 
-        log_event(
-            self.db,
+            environment = self._get_environment_cached(environment_id)
+            if not environment:
+                return None, "Environment not found"
+
+            if not environment.deploy_command:
+                return None, "No deploy command configured for environment"
+
+            error = self._reserve_environment(environment_id)
+            if error:
+                return None, error
+
+            # Get previous deployment for rollback reference
+            latest = self.get_latest_deployment(environment_id)
+            previous_sha = latest.commit_sha if latest else None
+
+            commit_sha = commit_future.result()
+
+        # Create deployment record; RETURNING loads id and server defaults
+        # in the same round-trip, so no follow-up refresh is needed
+        deployment = self.db.execute(
+            insert(DeploymentHistory).values(
+                run_id=run_id,
+                environment_id=environment_id,
+                commit_sha=commit_sha,
+                previous_commit_sha=previous_sha,
+                status=DeploymentStatus.DEPLOYING,
+                deploy_command_used=environment.deploy_command,
+                triggered_by=triggered_by,
+                approved_by=approved_by
+            ).returning(DeploymentHistory)
+        ).scalar_one()
+
+        self._audit(
             actor=triggered_by,
             action="start_deployment",
-            entity_type="deployment",
             entity_id=deployment.id,
             details={
                 "run_id": run_id,
@@ -118,6 +505,7 @@ class DeploymentService:
                 "commit_sha": commit_sha
             }
         )
+        self._commit()
 
         return deployment, None
 
@@ -126,84 +514,83 @@ class DeploymentService:
 
         Returns (success, output/error).
         """
-        deployment = self.db.query(DeploymentHistory).filter(
-            DeploymentHistory.id == deployment_id
-        ).first()
-
-        if not deployment:
+        context = self._get_deployment_context(deployment_id)
+        if not context:
             return False, "Deployment not found"
 
-        environment = self.db.query(Environment).filter(
-            Environment.id == deployment.environment_id
-        ).first()
+        deployment, environment, _, project = context
 
         if not environment:
             return False, "Environment not found"
 
-        project = self.db.query(Project).filter(
-            Project.id == self.db.query(Run).filter(Run.id == deployment.run_id).first().project_id
-        ).first()
+        if not self._claim_deployment(deployment_id):
+            return False, "Deployment is no longer in progress"
 
         # Execute deployment command
         try:
-            result = subprocess.run(
-                deployment.deploy_command_used,
-                shell=True,
+            args, use_shell = _parse_command(deployment.deploy_command_used)
+            returncode, output = _stream_command(
+                args,
+                use_shell,
                 cwd=project.repo_path if project and project.repo_path else None,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
+                timeout=DEPLOY_TIMEOUT_SECONDS,
+                log_path=deployment_log_path(deployment_id)
             )
 
-            deployment.deploy_output = result.stdout + result.stderr
+            deployment.deploy_output = output
+            # One timestamp for the stage so related columns compare equal
+            now = datetime.now(timezone.utc)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 deployment.status = DeploymentStatus.DEPLOYED
-                deployment.completed_at = datetime.now(timezone.utc)
+                deployment.completed_at = now
 
                 # Update environment timestamps
-                environment.last_deploy_at = datetime.now(timezone.utc)
+                self._update_environment(environment.id, last_deploy_at=now)
 
-                self.db.commit()
+                # Settle unconfigured stages now so the flow can skip them
+                if not environment.health_check_url:
+                    deployment.health_check_passed = True
+                    deployment.health_check_at = now
+                if not environment.test_command:
+                    deployment.test_passed = True
+                    deployment.test_at = now
 
-                log_event(
-                    self.db,
+                self._audit(
                     actor="agent",
                     action="deploy_success",
-                    entity_type="deployment",
                     entity_id=deployment_id,
                     details={"output_length": len(deployment.deploy_output)}
                 )
+                self._commit()
 
                 return True, deployment.deploy_output
             else:
                 deployment.status = DeploymentStatus.FAILED
-                deployment.completed_at = datetime.now(timezone.utc)
-                self.db.commit()
+                deployment.completed_at = now
 
-                log_event(
-                    self.db,
+                self._audit(
                     actor="agent",
                     action="deploy_failed",
-                    entity_type="deployment",
                     entity_id=deployment_id,
-                    details={"exit_code": result.returncode}
+                    details={"exit_code": returncode}
                 )
+                self._commit()
 
                 return False, f"Deploy command failed: {deployment.deploy_output}"
 
         except subprocess.TimeoutExpired:
             deployment.status = DeploymentStatus.FAILED
-            deployment.deploy_output = "Deployment timed out after 5 minutes"
+            deployment.deploy_output = f"Deployment timed out after {DEPLOY_TIMEOUT_SECONDS} seconds"
             deployment.completed_at = datetime.now(timezone.utc)
-            self.db.commit()
+            self._commit()
             return False, "Deployment timed out"
 
         except Exception as e:
             deployment.status = DeploymentStatus.FAILED
-            deployment.deploy_output = str(e)
+            deployment.deploy_output = _cap_output(str(e))
             deployment.completed_at = datetime.now(timezone.utc)
-            self.db.commit()
+            self._commit()
             return False, str(e)
 
     def run_health_check(self, deployment_id: int) -> Tuple[bool, dict]:
@@ -211,139 +598,170 @@ class DeploymentService:
 
         Returns (passed, response_data).
         """
-        deployment = self.db.query(DeploymentHistory).filter(
-            DeploymentHistory.id == deployment_id
-        ).first()
-
-        if not deployment:
+        context = self._get_deployment_context(deployment_id)
+        if not context:
             return False, {"error": "Deployment not found"}
 
-        environment = self.db.query(Environment).filter(
-            Environment.id == deployment.environment_id
-        ).first()
+        deployment, environment, _, _ = context
 
         if not environment or not environment.health_check_url:
-            # No health check configured, assume success
-            deployment.health_check_passed = True
-            deployment.health_check_at = datetime.now(timezone.utc)
-            self.db.commit()
-            return True, {"message": "No health check configured"}
+            return self._record_health_check_skipped(deployment)
 
         try:
-            response = requests.get(
+            response = self._http.get(
                 environment.health_check_url,
-                timeout=30,
+                timeout=HEALTH_CHECK_TIMEOUT_SECONDS,
                 verify=True
             )
+        except requests.RequestException as e:
+            return self._record_health_check_error(deployment, environment, e)
 
-            response_data = {
-                "status_code": response.status_code,
-                "response_time_ms": response.elapsed.total_seconds() * 1000,
-                "url": environment.health_check_url
-            }
+        return self._record_health_check_response(deployment, environment, response)
 
-            # Try to parse JSON response
-            try:
-                response_data["body"] = response.json()
-            except Exception:
-                response_data["body"] = response.text[:500]  # Truncate large responses
+    async def run_health_check_async(self, deployment_id: int) -> Tuple[bool, dict]:
+        """Run health check for a deployment without blocking the event loop.
 
-            passed = 200 <= response.status_code < 300
+        Same contract as run_health_check, but probes with httpx.AsyncClient so
+        it can be awaited alongside other deployment stages.
+        Returns (passed, response_data).
+        """
+        context = self._get_deployment_context(deployment_id)
+        if not context:
+            return False, {"error": "Deployment not found"}
 
-            deployment.health_check_passed = passed
-            deployment.health_check_response = response_data
-            deployment.health_check_at = datetime.now(timezone.utc)
-            environment.last_health_check_at = datetime.now(timezone.utc)
-            environment.is_healthy = passed
-            self.db.commit()
+        deployment, environment, _, _ = context
 
-            log_event(
-                self.db,
-                actor="agent",
-                action="health_check",
-                entity_type="deployment",
-                entity_id=deployment_id,
-                details={"passed": passed, "status_code": response.status_code}
-            )
+        if not environment or not environment.health_check_url:
+            return self._record_health_check_skipped(deployment)
 
-            return passed, response_data
+        try:
+            # AsyncClient is bound to the running loop, so it lives per stage
+            async with httpx.AsyncClient(timeout=HEALTH_CHECK_TIMEOUT_SECONDS, verify=True) as client:
+                response = await client.get(environment.health_check_url)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return self._record_health_check_error(deployment, environment, e)
+
+        return self._record_health_check_response(deployment, environment, response)
+
+    def _record_health_check_skipped(self, deployment: DeploymentHistory) -> Tuple[bool, dict]:
+        """Record a passing health check when no URL is configured."""
+        deployment.health_check_passed = True
+        deployment.health_check_at = datetime.now(timezone.utc)
+        self._commit()
+        return True, {"message": "No health check configured"}
+
+    def _record_health_check_response(
+        self,
+        deployment: DeploymentHistory,
+        environment: Environment,
+        response
+    ) -> Tuple[bool, dict]:
+        """Record a health check HTTP response (requests or httpx).
 
-        except requests.RequestException as e:
-            error_data = {"error": str(e), "url": environment.health_check_url}
+        Returns (passed, response_data).
+        """
+        response_data = {
+            "status_code": response.status_code,
+            "response_time_ms": response.elapsed.total_seconds() * 1000,
+            "url": environment.health_check_url
+        }
 
-            deployment.health_check_passed = False
-            deployment.health_check_response = error_data
-            deployment.health_check_at = datetime.now(timezone.utc)
-            environment.is_healthy = False
-            self.db.commit()
+        # Try to parse JSON response
+        try:
+            response_data["body"] = response.json()
+        except Exception:
+            response_data["body"] = response.text[:500]  # Truncate large responses
+
+        passed = 200 <= response.status_code < 300
+
+        deployment.health_check_passed = passed
+        deployment.health_check_response = response_data
+        now = datetime.now(timezone.utc)
+        deployment.health_check_at = now
+        self._update_environment(environment.id, last_health_check_at=now, is_healthy=passed)
+
+        self._audit(
+            actor="agent",
+            action="health_check",
+            entity_id=deployment.id,
+            details={"passed": passed, "status_code": response.status_code}
+        )
+        self._commit()
+
+        return passed, response_data
+
+    def _record_health_check_error(
+        self,
+        deployment: DeploymentHistory,
+        environment: Environment,
+        error: Exception
+    ) -> Tuple[bool, dict]:
+        """Record a health check that failed before getting a response."""
+        error_data = {"error": str(error), "url": environment.health_check_url}
 
-            return False, error_data
+        deployment.health_check_passed = False
+        deployment.health_check_response = error_data
+        deployment.health_check_at = datetime.now(timezone.utc)
+        self._update_environment(environment.id, is_healthy=False)
+        self._commit()
+
+        return False, error_data
 
     def run_test_suite(self, deployment_id: int) -> Tuple[bool, str]:
         """Run the test suite for a deployment.
 
         Returns (passed, output).
         """
-        deployment = self.db.query(DeploymentHistory).filter(
-            DeploymentHistory.id == deployment_id
-        ).first()
-
-        if not deployment:
+        context = self._get_deployment_context(deployment_id)
+        if not context:
             return False, "Deployment not found"
 
-        environment = self.db.query(Environment).filter(
-            Environment.id == deployment.environment_id
-        ).first()
+        deployment, environment, _, project = context
 
         if not environment or not environment.test_command:
             # No test command configured
             deployment.test_passed = True
             deployment.test_at = datetime.now(timezone.utc)
-            self.db.commit()
+            self._commit()
             return True, "No test command configured"
 
-        run = self.db.query(Run).filter(Run.id == deployment.run_id).first()
-        project = self.db.query(Project).filter(Project.id == run.project_id).first() if run else None
-
         try:
-            result = subprocess.run(
-                environment.test_command,
-                shell=True,
+            args, use_shell = _parse_command(environment.test_command)
+            returncode, output = _stream_command(
+                args,
+                use_shell,
                 cwd=project.repo_path if project and project.repo_path else None,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout for tests
+                timeout=TEST_TIMEOUT_SECONDS,
+                log_path=deployment_log_path(deployment_id, "tests")
             )
 
             deployment.test_command_used = environment.test_command
-            deployment.test_output = result.stdout + result.stderr
-            deployment.test_passed = result.returncode == 0
+            deployment.test_output = output
+            deployment.test_passed = returncode == 0
             deployment.test_at = datetime.now(timezone.utc)
-            self.db.commit()
 
-            log_event(
-                self.db,
+            self._audit(
                 actor="agent",
                 action="run_tests",
-                entity_type="deployment",
                 entity_id=deployment_id,
-                details={"passed": deployment.test_passed, "exit_code": result.returncode}
+                details={"passed": deployment.test_passed, "exit_code": returncode}
             )
+            self._commit()
 
             return deployment.test_passed, deployment.test_output
 
         except subprocess.TimeoutExpired:
             deployment.test_passed = False
-            deployment.test_output = "Tests timed out after 10 minutes"
+            deployment.test_output = f"Tests timed out after {TEST_TIMEOUT_SECONDS} seconds"
             deployment.test_at = datetime.now(timezone.utc)
-            self.db.commit()
+            self._commit()
             return False, "Tests timed out"
 
         except Exception as e:
             deployment.test_passed = False
-            deployment.test_output = str(e)
+            deployment.test_output = _cap_output(str(e))
             deployment.test_at = datetime.now(timezone.utc)
-            self.db.commit()
+            self._commit()
             return False, str(e)
 
     def rollback(
@@ -363,13 +781,12 @@ class DeploymentService:
 
         Returns (new_deployment, error_message).
         """
-        current = self.db.query(DeploymentHistory).filter(
-            DeploymentHistory.id == deployment_id
-        ).first()
-
-        if not current:
+        context = self._get_deployment_context(deployment_id)
+        if not context:
             return None, "Deployment not found"
 
+        current, environment, _, _ = context
+
         # Find target deployment to rollback to
         if target_deployment_id:
             target = self.db.query(DeploymentHistory).filter(
@@ -381,10 +798,6 @@ class DeploymentService:
         if not target:
             return None, "No previous deployment to rollback to"
 
-        environment = self.db.query(Environment).filter(
-            Environment.id == current.environment_id
-        ).first()
-
         if not environment:
             return None, "Environment not found"
 
@@ -397,39 +810,41 @@ class DeploymentService:
         if not rollback_cmd:
             return None, "No rollback command and no target commit SHA"
 
+        error = self._reserve_environment(environment.id)
+        if error:
+            return None, error
+
         # Substitute placeholders in rollback command
-        rollback_cmd = rollback_cmd.format(
+        rollback_cmd = _render_rollback_command(
+            rollback_cmd,
             commit_sha=target.commit_sha or "",
             version=target.version or "",
             previous_sha=current.commit_sha or ""
         )
 
-        # Create rollback deployment record
-        rollback_deployment = DeploymentHistory(
-            run_id=current.run_id,
-            environment_id=current.environment_id,
-            commit_sha=target.commit_sha,
-            previous_commit_sha=current.commit_sha,
-            status=DeploymentStatus.DEPLOYING,
-            deploy_command_used=rollback_cmd,
-            is_rollback=True,
-            rolled_back_from_id=deployment_id,
-            rolled_back_to_id=target.id,
-            rollback_reason=reason,
-            triggered_by=triggered_by
-        )
-        self.db.add(rollback_deployment)
+        # Create rollback deployment record (INSERT ... RETURNING)
+        rollback_deployment = self.db.execute(
+            insert(DeploymentHistory).values(
+                run_id=current.run_id,
+                environment_id=current.environment_id,
+                commit_sha=target.commit_sha,
+                previous_commit_sha=current.commit_sha,
+                status=DeploymentStatus.DEPLOYING,
+                deploy_command_used=rollback_cmd,
+                is_rollback=True,
+                rolled_back_from_id=deployment_id,
+                rolled_back_to_id=target.id,
+                rollback_reason=reason,
+                triggered_by=triggered_by
+            ).returning(DeploymentHistory)
+        ).scalar_one()
 
         # Mark current deployment as rolled back
         current.status = DeploymentStatus.ROLLED_BACK
-        self.db.commit()
-        self.db.refresh(rollback_deployment)
 
-        log_event(
-            self.db,
+        self._audit(
             actor=triggered_by,
             action="rollback",
-            entity_type="deployment",
             entity_id=rollback_deployment.id,
             details={
                 "from_deployment": deployment_id,
@@ -437,6 +852,7 @@ class DeploymentService:
                 "reason": reason
             }
         )
+        self._commit()
 
         return rollback_deployment, None
 
@@ -480,8 +896,11 @@ class DeploymentService:
         success, output = self.execute_deployment(rollback_deployment.id)
 
         if success:
-            # Verify health after rollback
-            health_passed, _ = self.run_health_check(rollback_deployment.id)
+            # Verify health after rollback; execute_deployment already settled
+            # the check when the environment has no health URL
+            health_passed = rollback_deployment.health_check_passed
+            if health_passed is None:
+                health_passed, _ = self.run_health_check(rollback_deployment.id)
             if health_passed:
                 return True, f"Auto-rollback successful: {reason}"
             else:
@@ -495,8 +914,15 @@ class DeploymentService:
         run_id: int = None,
         limit: int = 20
     ) -> List[DeploymentHistory]:
-        """Get deployment history with optional filters."""
-        query = self.db.query(DeploymentHistory)
+        """Get deployment history with optional filters.
+
+        Environment, run, and project are eager-loaded with one extra
+        SELECT ... IN per relationship, so callers walking them avoid N+1.
+        """
+        query = self.db.query(DeploymentHistory).options(
+            selectinload(DeploymentHistory.environment),
+            selectinload(DeploymentHistory.run).selectinload(Run.project),
+        )
 
         if environment_id:
             query = query.filter(DeploymentHistory.environment_id == environment_id)
@@ -511,6 +937,10 @@ class DeploymentService:
         if not repo_path or not os.path.exists(repo_path):
             return None
 
+        sha = read_git_head(repo_path)
+        if sha:
+            return sha
+
         try:
             result = subprocess.run(
                 ["git", "rev-parse", "HEAD"],
@@ -525,6 +955,78 @@ class DeploymentService:
 
         return None
 
+    def _update_environment(self, environment_id: int, **values):
+        """Write environment status columns with one UPDATE statement.
+
+        Bypasses unit-of-work change tracking; the cached Environment in
+        the session is synchronized in place, so no refetch is needed.
+        """
+        self.db.execute(
+            update(Environment).where(Environment.id == environment_id).values(**values)
+        )
+
+    def _audit(self, actor: str, action: str, entity_id: int = None, details: dict = None):
+        """Buffer a deployment audit event; written by the next _commit()."""
+        self._audit_buf.append({
+            "actor": actor,
+            "action": action,
+            "entity_type": "deployment",
+            "entity_id": entity_id,
+            "details": details,
+        })
+
+    def _commit(self):
+        """Commit a stage's state change and audit entries as one transaction.
+
+        Buffered audit events go out as a single executemany INSERT.
+        """
+        try:
+            if self._audit_buf:
+                self.db.execute(insert(AuditEvent), self._audit_buf)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self._audit_buf = []
+
+    def _run_isolated(self, method_name: str, *args):
+        """Run a service method on its own Session.
+
+        SQLAlchemy Sessions are not thread-safe, so each worker thread in
+        complete_deployment_flow gets a dedicated Session on the same engine.
+        """
+        db = Session(bind=self.db.get_bind(), autoflush=False)
+        try:
+            return getattr(DeploymentService(db), method_name)(*args)
+        finally:
+            db.close()
+
+    async def _run_post_deploy_checks(
+        self,
+        deployment_id: int,
+        environment: Environment,
+        executor: ThreadPoolExecutor
+    ):
+        """Await the health check while the test suite runs on a worker thread.
+
+        Stages the environment does not configure were already settled by
+        execute_deployment and are skipped without touching the database.
+        Returns ((health_passed, health_data), (tests_passed, test_output)).
+        """
+        async def skipped(stage_result):
+            return stage_result
+
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            self.run_health_check_async(deployment_id)
+            if environment.health_check_url
+            else skipped((True, {"message": "No health check configured"})),
+            loop.run_in_executor(executor, self._run_isolated, "run_test_suite", deployment_id)
+            if environment.test_command
+            else skipped((True, "No test command configured")),
+        )
+
     def complete_deployment_flow(
         self,
         run_id: int,
@@ -535,16 +1037,6 @@ class DeploymentService:
 
         Returns (success, result_dict).
         """
-        result = {
-            "deployment_id": None,
-            "deploy_success": False,
-            "health_check_passed": None,
-            "tests_passed": None,
-            "rollback_triggered": False,
-            "final_status": None,
-            "messages": []
-        }
-
         # Start deployment
         deployment, error = self.start_deployment(
             run_id=run_id,
@@ -554,11 +1046,44 @@ class DeploymentService:
         )
 
         if error:
-            result["messages"].append(f"Failed to start deployment: {error}")
+            return False, {
+                "deployment_id": None,
+                "deploy_success": False,
+                "health_check_passed": None,
+                "tests_passed": None,
+                "rollback_triggered": False,
+                "final_status": "failed",
+                "messages": [f"Failed to start deployment: {error}"]
+            }
+
+        return self.run_deployment_flow(deployment.id)
+
+    def run_deployment_flow(self, deployment_id: int) -> Tuple[bool, dict]:
+        """Run deploy, health check, tests and auto-rollback for a started deployment.
+
+        This is the long-running half of complete_deployment_flow; the job
+        worker calls it for deployments enqueued by the API.
+        Returns (success, result_dict).
+        """
+        result = {
+            "deployment_id": deployment_id,
+            "deploy_success": False,
+            "health_check_passed": None,
+            "tests_passed": None,
+            "rollback_triggered": False,
+            "final_status": None,
+            "messages": []
+        }
+
+        context = self._get_deployment_context(deployment_id)
+        if not context:
+            result["messages"].append("Deployment not found")
             result["final_status"] = "failed"
             return False, result
 
-        result["deployment_id"] = deployment.id
+        deployment, _, run, _ = context
+        run_id = deployment.run_id
+        environment_id = deployment.environment_id
 
         # Execute deployment
         success, output = self.execute_deployment(deployment.id)
@@ -571,29 +1096,34 @@ class DeploymentService:
 
         result["messages"].append("Deployment successful")
 
-        # Run health check
-        health_passed, health_data = self.run_health_check(deployment.id)
-        result["health_check_passed"] = health_passed
-
-        if not health_passed:
-            result["messages"].append(f"Health check failed: {health_data}")
+        environment = self._get_environment_cached(environment_id)
 
-            # Trigger auto-rollback
-            rollback_triggered, rollback_msg = self.auto_rollback_on_failure(deployment.id)
-            result["rollback_triggered"] = rollback_triggered
-            result["messages"].append(rollback_msg)
-            result["final_status"] = "rolled_back"
-            return False, result
+        if environment.health_check_url or environment.test_command:
+            # Health check (network) and test suite (subprocess) are independent,
+            # so run them concurrently; wall-clock is the slower of the two.
+            with ThreadPoolExecutor(max_workers=FLOW_MAX_WORKERS) as executor:
+                (health_passed, health_data), (tests_passed, test_output) = asyncio.run(
+                    self._run_post_deploy_checks(deployment.id, environment, executor)
+                )
 
-        result["messages"].append("Health check passed")
+            # The test worker's session committed its results; drop our stale copies
+            self.db.expire_all()
+        else:
+            health_passed, tests_passed = True, True
+            health_data = {"message": "No health check configured"}
 
-        # Run test suite
-        tests_passed, test_output = self.run_test_suite(deployment.id)
+        result["health_check_passed"] = health_passed
         result["tests_passed"] = tests_passed
 
+        if not health_passed:
+            result["messages"].append(f"Health check failed: {health_data}")
+        else:
+            result["messages"].append("Health check passed")
+
         if not tests_passed:
             result["messages"].append(f"Tests failed")
 
+        if not (health_passed and tests_passed):
             # Trigger auto-rollback
             rollback_triggered, rollback_msg = self.auto_rollback_on_failure(deployment.id)
             result["rollback_triggered"] = rollback_triggered
@@ -605,10 +1135,9 @@ class DeploymentService:
         result["final_status"] = "deployed"
 
         # Update run state to DEPLOYED
-        run = self.db.query(Run).filter(Run.id == run_id).first()
         if run and run.state == RunState.TESTING:
             run.state = RunState.DEPLOYED
-            self.db.commit()
+            self._commit()
 
             dispatch_webhook(EVENT_STATE_CHANGE, {
                 "run_id": run_id,
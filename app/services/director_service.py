@@ -12,54 +12,171 @@ The Director actively:
 - Triggers agent execution when tasks are ready
 - Monitors progress and advances pipeline stages
 """
+import itertools
+import json
 import os
+import queue
+import re
 import time
 import subprocess
 import threading
-from datetime import datetime
-from typing import Optional, List, Dict, Tuple
-from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, List, Dict, Tuple
+from sqlalchemy import Integer, any_, bindparam, func, insert, lambda_stmt, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.task import Task, TaskStatus, TaskPipelineStage
 from app.models.run import Run, RunState
 from app.models.project import Project
+from app.models.requirement import task_requirements
 from app.models.report import AgentReport, AgentRole, ReportStatus
-from app.models.audit import log_event
+from app.models.audit import audit_buffer, log_event
+from app.models.task_retry_state import TaskRetryState
 from app.services.quality_requirements_service import load_quality_requirements
-from django.conf import settings
 
 
-# Default acceptance criteria templates by task type pattern
+# Repository paths used when launching agents and loading default templates
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+AGENT_RUNNER_PATH = os.path.join(BASE_DIR, "scripts", "agent_runner.py")
+WORKSPACES_DIR = os.path.join(BASE_DIR, "workspaces")
+DEFAULT_QA_REQUIREMENTS_PATH = os.path.join(BASE_DIR, "config", "qa_requirements.json")
+
+# agent_runner stdout/stderr are streamed to logs/agents/run_<id>/ instead of memory
+AGENT_LOG_DIR = os.path.join(BASE_DIR, "logs", "agents")
+AGENT_TIMEOUT_SECONDS = 1800  # 30 minutes
+AGENT_LOG_TAIL_BYTES = 500  # Printed from each log when the agent exits
+
+# Django's BASE_DIR, read on first use so importing this module does not touch settings
+_settings_base_dir = None
+
+
+def _get_settings_base_dir() -> str:
+    """Return settings.BASE_DIR, cached after the first lookup."""
+    global _settings_base_dir
+    if _settings_base_dir is None:
+        from django.conf import settings
+        _settings_base_dir = str(settings.BASE_DIR)
+    return _settings_base_dir
+
+
+# Subtasks inserted per transaction when a template expands into a large checklist
+SUBTASK_INSERT_BATCH = 200
+
+# Default acceptance criteria templates by task type pattern (shared; copied
+# into a list only when assigned to a task)
 ACCEPTANCE_CRITERIA_TEMPLATES = {
-    "feature": [
+    "feature": (
         "Feature is implemented as described",
         "Unit tests cover core functionality",
         "No regressions in existing tests",
         "Code follows project style guidelines",
-    ],
-    "bugfix": [
+    ),
+    "bugfix": (
         "Bug is fixed and no longer reproducible",
         "Regression test added to prevent recurrence",
         "Root cause documented in commit message",
-    ],
-    "refactor": [
+    ),
+    "refactor": (
         "Functionality unchanged (all existing tests pass)",
         "Code complexity reduced or maintainability improved",
         "No performance regressions",
-    ],
-    "security": [
+    ),
+    "security": (
         "Security vulnerability addressed",
         "Security test added to verify fix",
         "No new vulnerabilities introduced",
-    ],
-    "default": [
+    ),
+    "default": (
         "Task requirements are satisfied",
         "Tests pass without errors",
         "Code is reviewed and follows project conventions",
-    ],
+    ),
 }
 
 
+# Task type detection, checked in order; substring match on title + description
+TASK_TYPE_PATTERNS = (
+    ("bugfix", re.compile("bug|fix|error|broken|crash")),
+    ("security", re.compile("security|vulnerability|exploit|cve")),
+    ("refactor", re.compile("refactor|cleanup|reorganize|optimize")),
+    ("feature", re.compile("feature|add|implement|create|new")),
+)
+
+# Eager loads for tasks passed to advance_task: subtask gating and template
+# inheritance read these collections, so load them per batch, not per task
+ADVANCE_TASK_LOAD_OPTIONS = (selectinload(Task.subtasks), selectinload(Task.requirements))
+
+# Parsed subtask templates per project: {project_id: ((config_id, version, updated_at), templates)}
+_SUBTASK_TEMPLATE_CACHE: Dict[int, Tuple[tuple, Optional[list]]] = {}
+
+# Agent runs are executed by a fixed pool of long-lived daemon threads
+# instead of one new thread per trigger; extra triggers wait in the queue.
+AGENT_POOL_SIZE = 8
+_agent_jobs: "queue.Queue" = queue.Queue()
+_agent_workers: List[threading.Thread] = []
+_agent_workers_lock = threading.Lock()
+
+
+def _agent_worker():
+    """Run queued agent jobs forever."""
+    while True:
+        job = _agent_jobs.get()
+        try:
+            job()
+        except Exception as e:
+            print(f"[Agent] Worker error: {e}")
+        finally:
+            _agent_jobs.task_done()
+
+
+def agent_log_paths(run_id: int) -> Tuple[str, str]:
+    """Paths of the (stdout, stderr) logs for an agent run."""
+    run_dir = os.path.join(AGENT_LOG_DIR, f"run_{run_id}")
+    return os.path.join(run_dir, "stdout.log"), os.path.join(run_dir, "stderr.log")
+
+
+def _read_log_tail(path: str, size: int = AGENT_LOG_TAIL_BYTES) -> str:
+    """Read the last `size` bytes of a log file without loading the rest."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - size, 0))
+        return f.read().decode("utf-8", errors="replace")
+
+
+def _id_list_filter(db: Session, column, ids):
+    """Filter `column` to ids passed as one bound parameter instead of one per id.
+
+    PostgreSQL gets `= ANY(:ids)` with an integer array and SQLite unpacks a
+    JSON list with json_each(), so the statement text (and its cached plan)
+    does not change with the number of ids. Other databases use IN.
+    """
+    ids = sorted(ids)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return column == any_(bindparam("id_list", ids, type_=ARRAY(Integer), unique=True))
+    if dialect == "sqlite":
+        return column.in_(
+            select(literal_column("value")).select_from(func.json_each(json.dumps(ids)))
+        )
+    return column.in_(ids)
+
+
+def _submit_agent_job(job):
+    """Queue an agent job, starting the worker pool on first use."""
+    with _agent_workers_lock:
+        while len(_agent_workers) < AGENT_POOL_SIZE:
+            worker = threading.Thread(
+                target=_agent_worker,
+                name=f"director-agent-{len(_agent_workers) + 1}",
+                daemon=True
+            )
+            worker.start()
+            _agent_workers.append(worker)
+    _agent_jobs.put(job)
+
+
 class DirectorService:
     """Orchestrates task progression through pipeline stages."""
 
@@ -74,6 +191,9 @@ class DirectorService:
         TaskPipelineStage.COMPLETE,
     ]
 
+    # Next stage for each stage in STAGE_ORDER (COMPLETE has none)
+    STAGE_NEXT = dict(zip(STAGE_ORDER, STAGE_ORDER[1:]))
+
     # Map stages to agent roles
     STAGE_TO_AGENT = {
         TaskPipelineStage.PM: AgentRole.PM,
@@ -83,6 +203,9 @@ class DirectorService:
         TaskPipelineStage.DOCS: AgentRole.DOCS,
     }
 
+    # agent_runner --agent value per stage, derived so the two maps cannot drift
+    _STAGE_TO_AGENT_STR = {stage: role.value for stage, role in STAGE_TO_AGENT.items()}
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -95,6 +218,24 @@ class DirectorService:
         Returns:
             Tuple of (is_ready, list_of_issues)
         """
+        issues = self._text_readiness_issues(task)
+
+        # Must have acceptance criteria
+        if not task.acceptance_criteria or len(task.acceptance_criteria) == 0:
+            issues.append("Task needs acceptance criteria")
+
+        return (len(issues) == 0, issues)
+
+    def _validate_after_enrich(self, task: Task, enriched: bool) -> Tuple[bool, List[str]]:
+        """Validate readiness, skipping the criteria check enrich_task just satisfied."""
+        if not enriched:
+            return self.validate_task_readiness(task)
+        issues = self._text_readiness_issues(task)
+        return (len(issues) == 0, issues)
+
+    @staticmethod
+    def _text_readiness_issues(task: Task) -> List[str]:
+        """Title and description checks from validate_task_readiness."""
         issues = []
 
         # Must have a title
@@ -105,16 +246,13 @@ class DirectorService:
         if not task.description or len(task.description.strip()) < 10:
             issues.append("Task needs a description (at least 10 chars)")
 
-        # Must have acceptance criteria
-        if not task.acceptance_criteria or len(task.acceptance_criteria) == 0:
-            issues.append("Task needs acceptance criteria")
-
-        return (len(issues) == 0, issues)
+        return issues
 
     def enrich_task(self, task: Task) -> Tuple[bool, str]:
         """Enrich a task with missing fields like acceptance criteria.
 
-        Uses templates based on task title/description patterns.
+        Uses templates based on task title/description patterns. Changes are
+        left in the session for the caller to commit.
 
         Args:
             task: Task to enrich
@@ -127,7 +265,7 @@ class DirectorService:
 
         # Generate acceptance criteria if missing
         if not task.acceptance_criteria or len(task.acceptance_criteria) == 0:
-            criteria = self._generate_acceptance_criteria(task)
+            criteria = list(self._generate_acceptance_criteria(task))
             task.acceptance_criteria = criteria
             modified = True
             messages.append(f"Added {len(criteria)} acceptance criteria")
@@ -141,40 +279,32 @@ class DirectorService:
                 details={
                     "task_id": task.task_id,
                     "added_criteria": criteria
-                }
+                },
+                commit=False
             )
 
-        if modified:
-            self.db.commit()
-
         return (modified, "; ".join(messages) if messages else "No enrichment needed")
 
-    def _generate_acceptance_criteria(self, task: Task) -> List[str]:
+    def _generate_acceptance_criteria(self, task: Task) -> Tuple[str, ...]:
         """Generate acceptance criteria based on task patterns.
 
         Args:
             task: Task to generate criteria for
 
         Returns:
-            List of acceptance criteria strings
+            Shared template tuple of acceptance criteria strings
         """
         title_lower = (task.title or "").lower()
         desc_lower = (task.description or "").lower()
         combined = f"{title_lower} {desc_lower}"
 
         # Detect task type from keywords
-        if any(word in combined for word in ["bug", "fix", "error", "broken", "crash"]):
-            template_key = "bugfix"
-        elif any(word in combined for word in ["security", "vulnerability", "exploit", "cve"]):
-            template_key = "security"
-        elif any(word in combined for word in ["refactor", "cleanup", "reorganize", "optimize"]):
-            template_key = "refactor"
-        elif any(word in combined for word in ["feature", "add", "implement", "create", "new"]):
-            template_key = "feature"
-        else:
-            template_key = "default"
+        template_key = next(
+            (key for key, pattern in TASK_TYPE_PATTERNS if pattern.search(combined)),
+            "default"
+        )
 
-        return ACCEPTANCE_CRITERIA_TEMPLATES.get(template_key, ACCEPTANCE_CRITERIA_TEMPLATES["default"]).copy()
+        return ACCEPTANCE_CRITERIA_TEMPLATES.get(template_key, ACCEPTANCE_CRITERIA_TEMPLATES["default"])
 
     def trigger_agent_for_task(self, task: Task) -> Tuple[bool, str, Optional[int]]:
         """Trigger agent execution for a task.
@@ -187,89 +317,121 @@ class DirectorService:
         Returns:
             Tuple of (success, message, run_id)
         """
-        # Get project for this task
-        project = self.db.query(Project).filter(Project.id == task.project_id).first()
-        if not project:
-            return (False, "Project not found", None)
+        return self.trigger_agents_for_tasks([task])[0]
+
+    def trigger_agents_for_tasks(self, tasks: List[Task]) -> List[Tuple[bool, str, Optional[int]]]:
+        """Trigger agent execution for several tasks.
+
+        Runs are created per project with one RunService.create_runs call
+        (a single commit) instead of one create_run per task.
+
+        Args:
+            tasks: Tasks to run agents for
+
+        Returns:
+            List of (success, message, run_id) tuples, in the order of tasks
+        """
+        results: List[Tuple[bool, str, Optional[int]]] = [None] * len(tasks)
+
+        by_project: Dict[int, List[int]] = {}
+        for index, task in enumerate(tasks):
+            by_project.setdefault(task.project_id, []).append(index)
+
+        projects = {
+            project.id: project
+            for project in self.db.query(Project).filter(Project.id.in_(by_project)).all()
+        } if by_project else {}
 
-        # Create a new run for this task
-        # NOTE: task.run_id removed in refactor - always create new run per task execution
         from app.services.run_service import RunService
         run_service = RunService(self.db)
-        run = run_service.create_run(
-            project_id=project.id,
-            name=f"Execute Task: {task.task_id} - {task.title[:50]}",
-            actor="director"
-        )
-        self.db.commit()
 
-        # Get project path
-        project_path = project.repo_path or os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "workspaces",
-            project.name.lower().replace(" ", "_")
-        )
+        for project_id, indexes in by_project.items():
+            project = projects.get(project_id)
+            if not project:
+                for index in indexes:
+                    results[index] = (False, "Project not found", None)
+                continue
+
+            # Create a new run for each task
+            # NOTE: task.run_id removed in refactor - always create new run per task execution
+            project_tasks = [tasks[index] for index in indexes]
+            # Read what the agents need now; the run commit expires the tasks
+            task_refs = [(task.id, task.task_id, task.pipeline_stage) for task in project_tasks]
+            runs = run_service.create_runs(
+                project_id=project.id,
+                names=[
+                    f"Execute Task: {task.task_id} - {(task.title or '')[:50]}"
+                    for task in project_tasks
+                ],
+                actor="director"
+            )
+
+            # Get project path
+            project_path = project.repo_path or os.path.join(
+                WORKSPACES_DIR,
+                project.name.lower().replace(" ", "_")
+            )
 
+            for index, (task_pk, task_ref, stage), run in zip(indexes, task_refs, runs):
+                self._submit_task_agent(task_pk, task_ref, stage, run.id, project_path)
+                results[index] = (True, f"Agent triggered for task {task_ref}", run.id)
+
+        return results
+
+    def _submit_task_agent(
+        self,
+        task_pk: int,
+        task_ref: str,
+        stage: Optional[TaskPipelineStage],
+        run_id: int,
+        project_path: str
+    ):
+        """Queue agent_runner for a task on the agent worker pool."""
         # Determine agent role based on pipeline stage
-        stage = task.pipeline_stage
-        if stage == TaskPipelineStage.DEV:
-            agent_role = "dev"
-        elif stage == TaskPipelineStage.QA:
-            agent_role = "qa"
-        elif stage == TaskPipelineStage.SEC:
-            agent_role = "security"
-        elif stage == TaskPipelineStage.DOCS:
-            agent_role = "docs"
-        else:
-            agent_role = "pm"  # Default to PM for planning stages
+        agent_role = self._STAGE_TO_AGENT_STR.get(stage, "pm")  # Default to PM for planning stages
 
-        # Spawn agent_runner in background thread using task-centric mode
+        # Run agent_runner on the agent worker pool using task-centric mode
         def run_agent():
             try:
-                agent_runner_path = os.path.join(
-                    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                    "scripts",
-                    "agent_runner.py"
-                )
                 # Use task command for task-centric execution with work_cycle API
                 cmd = [
-                    "python", agent_runner_path, "task",
+                    "python", AGENT_RUNNER_PATH, "task",
                     "--agent", agent_role,
-                    "--task-id", str(task.id),
-                    "--run-id", str(run.id),
+                    "--task-id", str(task_pk),
+                    "--run-id", str(run_id),
                     "--project-path", project_path
                 ]
                 print(f"[Agent] Running: {' '.join(cmd)}")
-                result = subprocess.run(
-                    cmd,
-                    timeout=1800,  # 30 minute timeout
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode != 0:
-                    print(f"[Agent] stderr: {result.stderr}")
-                print(f"[Agent] stdout: {result.stdout[:500] if result.stdout else 'empty'}")
+                stdout_path, stderr_path = agent_log_paths(run_id)
+                os.makedirs(os.path.dirname(stdout_path), exist_ok=True)
+                with open(stdout_path, "wb") as stdout_log, open(stderr_path, "wb") as stderr_log:
+                    proc = subprocess.Popen(cmd, stdout=stdout_log, stderr=stderr_log)
+                    try:
+                        returncode = proc.wait(timeout=AGENT_TIMEOUT_SECONDS)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        proc.wait()
+                        raise
+                if returncode != 0:
+                    print(f"[Agent] stderr: {_read_log_tail(stderr_path)}")
+                print(f"[Agent] stdout: {_read_log_tail(stdout_path) or 'empty'} (full log: {stdout_path})")
             except Exception as e:
-                print(f"Agent execution error for task {task.task_id}: {e}")
+                print(f"Agent execution error for task {task_ref}: {e}")
 
-        thread = threading.Thread(target=run_agent, daemon=True)
-        thread.start()
+        _submit_agent_job(run_agent)
 
-        log_event(
-            self.db,
+        audit_buffer.add(
             actor="director",
             action="trigger_agent",
             entity_type="task",
-            entity_id=task.id,
+            entity_id=task_pk,
             details={
-                "task_id": task.task_id,
-                "run_id": run.id,
-                "stage": task.pipeline_stage.value if task.pipeline_stage else "none"
+                "task_id": task_ref,
+                "run_id": run_id,
+                "stage": stage.value if stage else "none"
             }
         )
 
-        return (True, f"Agent triggered for task {task.task_id}", run.id)
-
     def prepare_and_run_task(self, task: Task) -> Dict:
         """Prepare a task (enrich if needed) and trigger agent execution.
 
@@ -295,9 +457,10 @@ class DirectorService:
         result["enriched"] = enriched
         if enriched:
             result["message"] = enrich_msg
+            self.db.commit()
 
         # Validate readiness
-        is_ready, issues = self.validate_task_readiness(task)
+        is_ready, issues = self._validate_after_enrich(task, enriched)
         if not is_ready:
             result["issues"] = issues
             result["message"] = f"Task not ready: {'; '.join(issues)}"
@@ -309,6 +472,7 @@ class DirectorService:
         result["run_id"] = run_id
         result["message"] = trigger_msg
 
+        audit_buffer.flush()
         return result
 
     def get_next_task(self, run_id: int = None) -> Optional[Task]:
@@ -333,10 +497,7 @@ class DirectorService:
 
         # NOTE: Task.run_id removed in refactor - filter by project of the run if run_id provided
         if run_id:
-            from app.models.run import Run
-            run = self.db.query(Run).filter(Run.id == run_id).first()
-            if run:
-                query = query.filter(Task.project_id == run.project_id)
+            query = query.join(Run, Run.project_id == Task.project_id).filter(Run.id == run_id)
 
         # Order by priority (higher first), then by stage (further along first)
         tasks = query.order_by(
@@ -344,20 +505,27 @@ class DirectorService:
             Task.pipeline_stage.desc()
         ).all()
 
+        # Skip blocked tasks (one dependency query for the whole batch)
+        blocked = Task.blocked_ids(self.db, tasks)
         for task in tasks:
-            # Skip blocked tasks
-            if task.is_blocked(self.db):
-                continue
-            return task
+            if task.id not in blocked:
+                return task
 
         return None
 
-    def advance_task(self, task: Task, report: AgentReport = None) -> Tuple[bool, str]:
+    def advance_task(
+        self,
+        task: Task,
+        report: AgentReport = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[bool, str]:
         """Advance a task to the next pipeline stage.
 
         Args:
             task: Task to advance
             report: Optional agent report with pass/fail status
+            now: Timestamp for completed_at; batch callers pass one for the
+                whole batch (defaults to the current UTC time)
 
         Returns:
             Tuple of (success, message)
@@ -368,21 +536,16 @@ class DirectorService:
         if report:
             if report.status == ReportStatus.FAIL:
                 # Loop back to DEV on failure
-                return self._loop_back_to_dev(task, report)
+                result = self._loop_back_to_dev(task, report)
+                self.db.commit()
+                return result
 
         # Get next stage
-        try:
-            current_idx = self.STAGE_ORDER.index(current_stage)
-            next_idx = current_idx + 1
+        if current_stage == TaskPipelineStage.COMPLETE:
+            return False, "Task already complete"
 
-            if next_idx >= len(self.STAGE_ORDER):
-                # Already at COMPLETE
-                return False, "Task already complete"
-
-            next_stage = self.STAGE_ORDER[next_idx]
-        except ValueError:
-            # Unknown stage, start from DEV
-            next_stage = TaskPipelineStage.DEV
+        # Unknown stage, start from DEV
+        next_stage = self.STAGE_NEXT.get(current_stage, TaskPipelineStage.DEV)
 
         # Prevent completion if subtasks are incomplete
         if next_stage == TaskPipelineStage.COMPLETE and self._has_incomplete_subtasks(task):
@@ -404,9 +567,7 @@ class DirectorService:
         elif next_stage == TaskPipelineStage.COMPLETE:
             task.status = TaskStatus.DONE
             task.completed = True
-            task.completed_at = datetime.utcnow()
-
-        self.db.commit()
+            task.completed_at = now or datetime.now(timezone.utc)
 
         log_event(
             self.db,
@@ -418,8 +579,10 @@ class DirectorService:
                 "from_stage": old_stage.value if old_stage else "none",
                 "to_stage": next_stage.value,
                 "task_id": task.task_id
-            }
+            },
+            commit=False
         )
+        self.db.commit()
 
         return True, f"Advanced from {old_stage.value if old_stage else 'none'} to {next_stage.value}"
 
@@ -438,8 +601,10 @@ class DirectorService:
         if not templates:
             return 0
 
-        created = 0
+        subtask_rows = []
+        inherit_flags = []
         existing_titles = {subtask.title for subtask in (task.subtasks or [])}
+        task_ids = self._next_task_ids(task.project_id)
         transition_from = (current_stage.value if current_stage else "none").lower()
         transition_to = (next_stage.value if next_stage else "none").lower()
 
@@ -453,7 +618,7 @@ class DirectorService:
             if not isinstance(requirements, list):
                 template_path = template.get("template_path")
                 if template_path and not os.path.isabs(template_path):
-                    template_path = os.path.join(settings.BASE_DIR, template_path)
+                    template_path = os.path.join(_get_settings_base_dir(), template_path)
                 requirements = load_quality_requirements(template_path)
             if not requirements:
                 continue
@@ -469,65 +634,79 @@ class DirectorService:
                 if title in existing_titles:
                     continue
 
-                subtask = Task(
-                    project_id=task.project_id,
-                    task_id=self._next_task_id(task.project_id),
-                    title=title,
-                    description=requirement.get("description", ""),
-                    status=TaskStatus.BACKLOG,
-                    priority=task.priority,
-                    pipeline_stage=stage_enum,
-                    acceptance_criteria=requirement.get("acceptance_criteria", []),
-                    parent_task_id=task.id
-                )
-                self.db.add(subtask)
-                if template.get("inherit_requirements", True) and task.requirements:
-                    subtask.requirements.extend(task.requirements)
-                created += 1
+                subtask_rows.append({
+                    "project_id": task.project_id,
+                    "task_id": next(task_ids),
+                    "title": title,
+                    "description": requirement.get("description", ""),
+                    "status": TaskStatus.BACKLOG,
+                    "priority": task.priority,
+                    "pipeline_stage": stage_enum,
+                    "acceptance_criteria": requirement.get("acceptance_criteria", []),
+                    "parent_task_id": task.id,
+                })
+                inherit_flags.append(bool(template.get("inherit_requirements", True)))
 
+        created = len(subtask_rows)
         if created:
-            self.db.commit()
-            log_event(
-                self.db,
+            parent_id, parent_ref = task.id, task.task_id
+            parent_requirement_ids = [req.id for req in task.requirements] if any(inherit_flags) else []
+
+            # Multi-row INSERTs for the subtasks and inherited requirements,
+            # committed every SUBTASK_INSERT_BATCH rows to keep transactions short
+            for start in range(0, created, SUBTASK_INSERT_BATCH):
+                end = start + SUBTASK_INSERT_BATCH
+                subtask_ids = self.db.scalars(
+                    insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                    subtask_rows[start:end]
+                ).all()
+
+                requirement_links = [
+                    {"task_id": subtask_id, "requirement_id": requirement_id}
+                    for subtask_id, inherit in zip(subtask_ids, inherit_flags[start:end]) if inherit
+                    for requirement_id in parent_requirement_ids
+                ]
+                if requirement_links:
+                    self.db.execute(insert(task_requirements), requirement_links)
+
+                self.db.commit()
+
+            audit_buffer.add(
                 actor="director",
                 action="create_subtasks_from_template",
                 entity_type="task",
-                entity_id=task.id,
-                details={"count": created, "task_id": task.task_id}
+                entity_id=parent_id,
+                details={"count": created, "task_id": parent_ref}
             )
 
         return created
 
     def _get_subtask_templates(self, project_id: int) -> list:
-        """Load subtask templates from active pipeline config or defaults."""
+        """Load subtask templates from active pipeline config or defaults.
+
+        Only the active config's (id, version, updated_at) is queried on each
+        call; the parsed templates are reused until that version changes.
+        """
         try:
             from app.models.pipeline_config import PipelineConfig
-            config = self.db.query(PipelineConfig).filter(
+            active = self.db.query(
+                PipelineConfig.id, PipelineConfig.version, PipelineConfig.updated_at
+            ).filter(
                 PipelineConfig.project_id == project_id,
                 PipelineConfig.is_active == True
             ).order_by(PipelineConfig.version.desc()).first()
 
-            if config:
-                if isinstance(config.settings, dict):
-                    templates = config.settings.get("subtask_templates")
-                    if isinstance(templates, list):
-                        return templates
-                if isinstance(config.nodes, list):
-                    node_templates = []
-                    for node in config.nodes:
-                        if node.get("type") != "subtask":
-                            continue
-                        data = node.get("data") or {}
-                        node_templates.append({
-                            "trigger_from": (data.get("triggerFrom") or "pm").lower(),
-                            "trigger_to": (data.get("triggerTo") or "dev").lower(),
-                            "template_path": data.get("templatePath") or "config/qa_requirements.json",
-                            "template_items": data.get("templateItems") if isinstance(data.get("templateItems"), list) else None,
-                            "auto_assign_stage": (data.get("autoAssignStage") or "dev").lower(),
-                            "inherit_requirements": bool(data.get("inheritRequirements", True)),
-                        })
-                    if node_templates:
-                        return node_templates
+            if active:
+                version_key = tuple(active)
+                cached = _SUBTASK_TEMPLATE_CACHE.get(project_id)
+                if cached and cached[0] == version_key:
+                    templates = cached[1]
+                else:
+                    config = self.db.query(PipelineConfig).filter(PipelineConfig.id == active.id).first()
+                    templates = self._templates_from_config(config) if config else None
+                    _SUBTASK_TEMPLATE_CACHE[project_id] = (version_key, templates)
+                if templates:
+                    return templates
         except Exception:
             pass
 
@@ -535,19 +714,51 @@ class DirectorService:
         return [{
             "trigger_from": "pm",
             "trigger_to": "dev",
-            "template_path": os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "qa_requirements.json"),
+            "template_path": DEFAULT_QA_REQUIREMENTS_PATH,
             "auto_assign_stage": "dev",
             "inherit_requirements": True
         }]
 
-    def _next_task_id(self, project_id: int) -> str:
-        """Generate next task_id for a project."""
+    @staticmethod
+    def _templates_from_config(config) -> Optional[list]:
+        """Extract subtask templates from a pipeline config's settings or nodes."""
+        if isinstance(config.settings, dict):
+            templates = config.settings.get("subtask_templates")
+            if isinstance(templates, list):
+                return templates
+        if isinstance(config.nodes, list):
+            node_templates = []
+            for node in config.nodes:
+                if node.get("type") != "subtask":
+                    continue
+                data = node.get("data") or {}
+                node_templates.append({
+                    "trigger_from": (data.get("triggerFrom") or "pm").lower(),
+                    "trigger_to": (data.get("triggerTo") or "dev").lower(),
+                    "template_path": data.get("templatePath") or "config/qa_requirements.json",
+                    "template_items": data.get("templateItems") if isinstance(data.get("templateItems"), list) else None,
+                    "auto_assign_stage": (data.get("autoAssignStage") or "dev").lower(),
+                    "inherit_requirements": bool(data.get("inheritRequirements", True)),
+                })
+            if node_templates:
+                return node_templates
+        return None
+
+    def _next_task_ids(self, project_id: int) -> Iterator[str]:
+        """Yield successive task_ids for a project.
+
+        Existing tasks are counted once, on the first id requested, so a batch
+        of subtasks costs one COUNT and gets distinct ids even before flush.
+        """
         count = self.db.query(Task).filter(Task.project_id == project_id).count()
-        return f"T{count + 1:03d}"
+        for number in itertools.count(count + 1):
+            yield f"T{number:03d}"
 
     def _loop_back_to_dev(self, task: Task, report: AgentReport) -> Tuple[bool, str]:
         """Loop a task back to DEV stage after failure.
 
+        The change is left in the session for the caller to commit.
+
         Args:
             task: Task that failed
             report: Failure report with details
@@ -559,8 +770,6 @@ class DirectorService:
         task.pipeline_stage = TaskPipelineStage.DEV
         task.status = TaskStatus.IN_PROGRESS
 
-        self.db.commit()
-
         log_event(
             self.db,
             actor="director",
@@ -571,18 +780,22 @@ class DirectorService:
                 "from_stage": old_stage.value if old_stage else "none",
                 "reason": report.summary if report else "Unknown failure",
                 "task_id": task.task_id
-            }
+            },
+            commit=False
         )
 
         return True, f"Looped back from {old_stage.value if old_stage else 'none'} to DEV"
 
-    def start_task(self, task: Task) -> Tuple[bool, str]:
+    def start_task(self, task: Task, check_blocked: bool = True) -> Tuple[bool, str]:
         """Start a task that's in BACKLOG.
 
-        Moves it to DEV stage and sets status to IN_PROGRESS.
+        Moves it to DEV stage and sets status to IN_PROGRESS. The change is
+        left in the session for the caller to commit.
 
         Args:
             task: Task to start
+            check_blocked: Set False when the caller already checked
+                dependencies for a batch with Task.blocked_ids
 
         Returns:
             Tuple of (success, message)
@@ -590,14 +803,12 @@ class DirectorService:
         if task.status != TaskStatus.BACKLOG:
             return False, f"Task is not in BACKLOG (current: {task.status.value})"
 
-        if task.is_blocked(self.db):
+        if check_blocked and task.is_blocked(self.db):
             return False, "Task is blocked by dependencies"
 
         task.status = TaskStatus.IN_PROGRESS
         task.pipeline_stage = TaskPipelineStage.DEV
 
-        self.db.commit()
-
         log_event(
             self.db,
             actor="director",
@@ -607,7 +818,8 @@ class DirectorService:
             details={
                 "task_id": task.task_id,
                 "title": task.title
-            }
+            },
+            commit=False
         )
 
         return True, f"Started task {task.task_id}"
@@ -626,10 +838,9 @@ class DirectorService:
 
         # NOTE: Task.run_id removed in refactor - filter by project of the run if run_id provided
         if run_id:
-            from app.models.run import Run
-            run = self.db.query(Run).filter(Run.id == run_id).first()
-            if run:
-                query = query.filter(Task.project_id == run.project_id)
+            project_id = self.db.query(Run.project_id).filter(Run.id == run_id).scalar()
+            if project_id is not None:
+                query = query.filter(Task.project_id == project_id)
 
         return query.order_by(Task.priority.desc()).all()
 
@@ -643,25 +854,24 @@ class DirectorService:
             Dict with stage counts and completion percentage
         """
         # NOTE: Task.run_id removed in refactor - get tasks by project of the run
-        from app.models.run import Run
-        run = self.db.query(Run).filter(Run.id == run_id).first()
-        if not run:
-            return {"total": 0, "stages": {}, "percent_complete": 0}
-        tasks = self.db.query(Task).filter(Task.project_id == run.project_id).all()
+        # Count per stage in the database rather than loading every task row
+        rows = self.db.query(Task.pipeline_stage, func.count(Task.id)).join(
+            Run, Run.project_id == Task.project_id
+        ).filter(Run.id == run_id).group_by(Task.pipeline_stage).all()
 
-        if not tasks:
+        if not rows:
             return {"total": 0, "stages": {}, "percent_complete": 0}
 
         stage_counts = {}
         for stage in TaskPipelineStage:
             stage_counts[stage.value] = 0
 
-        for task in tasks:
-            stage = task.pipeline_stage or TaskPipelineStage.NONE
-            stage_counts[stage.value] += 1
+        for stage, count in rows:
+            stage = stage or TaskPipelineStage.NONE
+            stage_counts[stage.value] += count
 
-        complete = stage_counts.get("complete", 0)
-        total = len(tasks)
+        complete = stage_counts[TaskPipelineStage.COMPLETE.value]
+        total = sum(stage_counts.values())
 
         return {
             "total": total,
@@ -689,25 +899,25 @@ class DirectorService:
         work_queue = []
         enriched_tasks = []
         triggered_tasks = []
+        to_trigger = []
         processed = 0
 
         # Get all active tasks for this run's project (include NULL pipeline_stage)
         # NOTE: Task.run_id removed in refactor - get tasks by project of the run
-        from app.models.run import Run
-        run = self.db.query(Run).filter(Run.id == run_id).first()
-        if not run:
+        project_id = self.db.query(Run.project_id).filter(Run.id == run_id).scalar()
+        if project_id is None:
             return {"work_queue": [], "enriched": [], "triggered": [], "message": "Run not found"}
         tasks = self.db.query(Task).filter(
-            Task.project_id == run.project_id,
-            Task.status != TaskStatus.DONE
+            Task.project_id == project_id,
+            Task.status != TaskStatus.DONE,
+            or_(Task.pipeline_stage.is_(None), Task.pipeline_stage != TaskPipelineStage.COMPLETE)
         ).order_by(Task.priority.desc()).limit(max_tasks).all()
 
-        for task in tasks:
-            # Skip completed tasks
-            if task.pipeline_stage == TaskPipelineStage.COMPLETE:
-                continue
+        # One dependency query for the batch instead of is_blocked() per task
+        blocked = Task.blocked_ids(self.db, tasks)
 
-            if task.is_blocked(self.db):
+        for task in tasks:
+            if task.id in blocked:
                 continue
 
             # Enrich task if missing acceptance criteria
@@ -719,7 +929,7 @@ class DirectorService:
                 })
 
             # Validate task is ready
-            is_ready, issues = self.validate_task_readiness(task)
+            is_ready, issues = self._validate_after_enrich(task, enriched)
             if not is_ready:
                 # Log but continue - task needs manual attention
                 log_event(
@@ -728,7 +938,8 @@ class DirectorService:
                     action="task_not_ready",
                     entity_type="task",
                     entity_id=task.id,
-                    details={"issues": issues}
+                    details={"issues": issues},
+                    commit=False
                 )
                 continue
 
@@ -738,7 +949,7 @@ class DirectorService:
 
             if stage == TaskPipelineStage.NONE:
                 # Task needs to start - move to DEV
-                success, msg = self.start_task(task)
+                success, msg = self.start_task(task, check_blocked=False)
                 if success:
                     stage = TaskPipelineStage.DEV
                 else:
@@ -760,12 +971,24 @@ class DirectorService:
 
                 # Auto-trigger agent if requested
                 if auto_trigger:
-                    triggered, msg, triggered_run_id = self.trigger_agent_for_task(task)
-                    if triggered:
-                        triggered_tasks.append({
-                            "task_id": task.task_id,
-                            "run_id": triggered_run_id
-                        })
+                    to_trigger.append(task)
+
+        # One commit for the batch's enrichments and task starts
+        self.db.commit()
+
+        # Create runs for the whole batch at once
+        if to_trigger:
+            for task, (triggered, msg, triggered_run_id) in zip(
+                to_trigger, self.trigger_agents_for_tasks(to_trigger)
+            ):
+                if triggered:
+                    triggered_tasks.append({
+                        "task_id": task.task_id,
+                        "run_id": triggered_run_id
+                    })
+
+        # Write this batch's agent trigger events in one INSERT
+        audit_buffer.flush()
 
         return {
             "run_id": run_id,
@@ -779,6 +1002,28 @@ class DirectorService:
         }
 
 
+class CycleSnapshot:
+    """Open-task counts by (status, pipeline_stage), read once per orchestration cycle.
+
+    run_cycle uses it to skip steps that have nothing to look at, so an idle
+    cycle costs one GROUP BY instead of a query (or several) per step.
+    """
+
+    def __init__(self, db: Session):
+        self.counts = {
+            (status, stage): count
+            for status, stage, count in db.query(
+                Task.status, Task.pipeline_stage, func.count(Task.id)
+            ).filter(
+                Task.status.in_([TaskStatus.BACKLOG, TaskStatus.IN_PROGRESS])
+            ).group_by(Task.status, Task.pipeline_stage).all()
+        }
+
+    def has(self, statuses, stages) -> bool:
+        """Return True if any open task has one of `statuses` and one of `stages`."""
+        return any(status in statuses and stage in stages for status, stage in self.counts)
+
+
 class TaskOrchestrator:
     """Algorithmic task orchestration with retry logic.
 
@@ -790,13 +1035,59 @@ class TaskOrchestrator:
 
     MAX_RETRIES = 3
     RETRY_INTERVAL_SECONDS = 300  # 5 minutes
+    STARTUP_GRACE_SECONDS = 30  # Daemon wait before its first cycle (restart overlap)
     MAX_CONCURRENT_PER_STAGE = 2  # Max tasks in progress per stage
-
-    def __init__(self, db: Session):
+    MAX_POLL_INTERVAL = 120  # Idle backoff ceiling (seconds)
+    POLL_BACKOFF = 2  # Multiplier per idle cycle
+    RECENT_RUNS_CHECKED = 5  # Runs per project searched for passing stage reports
+    ACTIVE_RUNS_CHECKED = 3  # Newest live runs per project checked before triggering
+    STALE_FAILED_RUN_AGE = timedelta(minutes=5)  # Runs with an older FAIL report are auto-killed
+
+    ACTIVE_RUN_STATES = (
+        RunState.PM, RunState.DEV, RunState.QA, RunState.SEC,
+        RunState.DOCS, RunState.TESTING,
+    )
+
+    ADVANCE_STAGES = (
+        TaskPipelineStage.DEV, TaskPipelineStage.QA,
+        TaskPipelineStage.SEC, TaskPipelineStage.DOCS,
+    )
+    # Include PM stage for planning/scoping work
+    TRIGGER_STAGES = (TaskPipelineStage.PM,) + ADVANCE_STAGES
+    # Stage filters for backlog starts and the stuck-task scan
+    UNSTARTED_STAGES = [TaskPipelineStage.NONE, None]
+    NOT_STUCK_STAGES = [TaskPipelineStage.COMPLETE, TaskPipelineStage.NONE, None]
+    # Stages enrich_incomplete_tasks and retry_stuck_tasks look at
+    ENRICH_STAGES = tuple(stage for stage in TaskPipelineStage if stage != TaskPipelineStage.COMPLETE)
+    RETRY_STAGES = tuple(
+        stage for stage in TaskPipelineStage
+        if stage not in (TaskPipelineStage.COMPLETE, TaskPipelineStage.NONE)
+    )
+
+    def __init__(self, db: Session, poll_interval: float = 30):
         self.db = db
         self.director = DirectorService(db)
-        # Track retry counts: {task_id: {"count": int, "last_attempt": datetime}}
-        self._retry_tracker = {}
+        # In-progress DEV count from this cycle's advance pass, reused by
+        # auto_start_backlog_tasks instead of a second COUNT (None = unknown)
+        self._dev_count = None
+        # Readiness results for trigger candidates: {task_id: (updated_at, (is_ready, issues))}
+        self._readiness_cache = {}
+        # Adaptive polling: reset to the base interval on activity, back off when idle
+        self._min_poll = poll_interval
+        self._poll_interval = poll_interval
+
+    def next_poll_interval(self, had_activity: bool) -> float:
+        """Return seconds to wait before the next cycle.
+
+        Stays at the configured interval while cycles take actions and grows
+        by POLL_BACKOFF per idle cycle, up to MAX_POLL_INTERVAL.
+        """
+        if had_activity:
+            self._poll_interval = self._min_poll
+        else:
+            ceiling = max(self._min_poll, self.MAX_POLL_INTERVAL)
+            self._poll_interval = min(ceiling, self._poll_interval * self.POLL_BACKOFF)
+        return self._poll_interval
 
     def check_and_advance_stuck_tasks(self) -> List[Dict]:
         """Check for tasks that should be advanced and advance them.
@@ -804,67 +1095,85 @@ class TaskOrchestrator:
         Returns list of actions taken.
         """
         actions = []
+        now = datetime.now(timezone.utc)
+
+        # One GROUP BY to find which stages (and projects) have in-progress tasks at all
+        active = self.db.query(Task.pipeline_stage, Task.project_id, func.count(Task.id)).filter(
+            Task.status == TaskStatus.IN_PROGRESS,
+            Task.pipeline_stage.in_(self.ADVANCE_STAGES)
+        ).group_by(Task.pipeline_stage, Task.project_id).all()
+        self._dev_count = sum(count for stage, _, count in active if stage == TaskPipelineStage.DEV)
+        if not active:
+            return actions
+        active_stages = {stage for stage, _, _ in active}
+
+        # Passing reports for all those projects in one query; advancing
+        # tasks does not add reports, so the set holds for the whole pass
+        passing = self._passing_report_roles({project_id for _, project_id, _ in active})
+        advanced_ids = []
 
         # Find tasks in IN_PROGRESS status for each pipeline stage
-        for stage in [TaskPipelineStage.DEV, TaskPipelineStage.QA,
-                      TaskPipelineStage.SEC, TaskPipelineStage.DOCS]:
+        for stage in self.ADVANCE_STAGES:
+            if stage not in active_stages:
+                continue
 
-            in_progress_tasks = self.db.query(Task).filter(
-                Task.pipeline_stage == stage,
-                Task.status == TaskStatus.IN_PROGRESS
-            ).all()
+            in_progress_tasks = self.db.execute(lambda_stmt(
+                lambda: select(Task).options(*ADVANCE_TASK_LOAD_OPTIONS).where(
+                    Task.pipeline_stage == stage,
+                    Task.status == TaskStatus.IN_PROGRESS
+                )
+            )).scalars().all()
 
+            role = self.director.STAGE_TO_AGENT.get(stage)
             for task in in_progress_tasks:
                 # Check if task has a passing report
-                if self._has_passing_report(task, stage):
+                if (task.project_id, role) in passing:
                     # Advance to next stage
-                    success, msg = self.director.advance_task(task)
+                    success, msg = self.director.advance_task(task, now=now)
                     if success:
+                        if stage == TaskPipelineStage.DEV:
+                            self._dev_count -= 1
                         actions.append({
                             "action": "advanced",
                             "task_id": task.id,
                             "from_stage": stage.value,
                             "message": msg
                         })
-                        # Reset retry counter
-                        if task.id in self._retry_tracker:
-                            del self._retry_tracker[task.id]
+                        advanced_ids.append(task.id)
+
+        # Reset retry counters of everything that advanced
+        if advanced_ids:
+            self.db.query(TaskRetryState).filter(
+                TaskRetryState.task_id.in_(advanced_ids)
+            ).delete(synchronize_session=False)
+            self.db.commit()
 
         return actions
 
-    def _has_passing_report(self, task: Task, stage: TaskPipelineStage) -> bool:
-        """Check if task has a passing agent report for the current stage.
+    def _passing_report_roles(self, project_ids) -> set:
+        """Return (project_id, role) pairs with a passing agent report.
 
-        This is where we'd check for proof-of-work or agent reports.
+        This is where we'd check for proof-of-work or agent reports. Only each
+        project's RECENT_RUNS_CHECKED most recent runs are considered.
         NOTE: task.run_id removed in refactor - check reports for recent project runs.
         """
-        # Map stage to role
-        stage_to_role = {
-            TaskPipelineStage.DEV: AgentRole.DEV,
-            TaskPipelineStage.QA: AgentRole.QA,
-            TaskPipelineStage.SEC: AgentRole.SECURITY,
-            TaskPipelineStage.DOCS: AgentRole.DOCS,
-        }
-
-        role = stage_to_role.get(stage)
-        if not role:
-            return False
-
-        # Get recent runs for this project and look for passing reports
-        recent_runs = self.db.query(Run).filter(
-            Run.project_id == task.project_id
-        ).order_by(Run.created_at.desc()).limit(5).all()
-
-        for run in recent_runs:
-            report = self.db.query(AgentReport).filter(
-                AgentReport.run_id == run.id,
-                AgentReport.role == role,
-                AgentReport.status == ReportStatus.PASS
-            ).order_by(AgentReport.created_at.desc()).first()
-            if report:
-                return True
-
-        return False
+        recent_runs = select(
+            Run.id,
+            Run.project_id,
+            func.row_number().over(
+                partition_by=Run.project_id,
+                order_by=Run.created_at.desc()
+            ).label("recency")
+        ).where(_id_list_filter(self.db, Run.project_id, project_ids)).subquery()
+
+        rows = self.db.query(recent_runs.c.project_id, AgentReport.role).join(
+            AgentReport, AgentReport.run_id == recent_runs.c.id
+        ).filter(
+            recent_runs.c.recency <= self.RECENT_RUNS_CHECKED,
+            AgentReport.status == ReportStatus.PASS
+        ).distinct().all()
+
+        return set(rows)
 
     def auto_start_backlog_tasks(self, max_to_start: int = 2) -> List[Dict]:
         """Auto-start BACKLOG tasks if there's bandwidth.
@@ -873,11 +1182,18 @@ class TaskOrchestrator:
         """
         actions = []
 
-        # Check current workload - how many tasks are in DEV?
-        dev_count = self.db.query(Task).filter(
-            Task.pipeline_stage == TaskPipelineStage.DEV,
-            Task.status == TaskStatus.IN_PROGRESS
-        ).count()
+        # Check current workload - how many tasks are in DEV? Reuse the count
+        # from this cycle's advance pass when there is one
+        dev_count, self._dev_count = self._dev_count, None
+        if dev_count is None:
+            # Only need to know whether we're at capacity: fetch at most that many ids
+            capacity = self.MAX_CONCURRENT_PER_STAGE
+            dev_count = len(self.db.execute(lambda_stmt(
+                lambda: select(Task.id).where(
+                    Task.pipeline_stage == TaskPipelineStage.DEV,
+                    Task.status == TaskStatus.IN_PROGRESS
+                ).limit(capacity)
+            )).all())
 
         # If we have room, start backlog tasks
         slots_available = self.MAX_CONCURRENT_PER_STAGE - dev_count
@@ -885,16 +1201,23 @@ class TaskOrchestrator:
             return actions
 
         # Find BACKLOG tasks ordered by priority
-        backlog_tasks = self.db.query(Task).filter(
-            Task.status == TaskStatus.BACKLOG,
-            Task.pipeline_stage.in_([TaskPipelineStage.NONE, None])
-        ).order_by(Task.priority.desc()).limit(min(slots_available, max_to_start)).all()
+        limit = min(slots_available, max_to_start)
+        unstarted = self.UNSTARTED_STAGES
+        backlog_tasks = self.db.execute(lambda_stmt(
+            lambda: select(Task).where(
+                Task.status == TaskStatus.BACKLOG,
+                Task.pipeline_stage.in_(unstarted)
+            ).order_by(Task.priority.desc(), Task.id.desc()).limit(limit)
+        )).scalars().all()
+
+        # One dependency query for the batch instead of is_blocked() per task
+        blocked = Task.blocked_ids(self.db, backlog_tasks)
 
         for task in backlog_tasks:
-            if task.is_blocked(self.db):
+            if task.id in blocked:
                 continue
 
-            success, msg = self.director.start_task(task)
+            success, msg = self.director.start_task(task, check_blocked=False)
             if success:
                 actions.append({
                     "action": "started",
@@ -904,6 +1227,9 @@ class TaskOrchestrator:
                     "message": msg
                 })
 
+        if actions:
+            self.db.commit()
+
         return actions
 
     def retry_stuck_tasks(self) -> List[Dict]:
@@ -913,39 +1239,57 @@ class TaskOrchestrator:
         retry up to MAX_RETRIES times.
         """
         actions = []
-        now = datetime.utcnow()
-
-        # Find tasks that might be stuck (IN_PROGRESS but no recent activity)
-        stuck_tasks = self.db.query(Task).filter(
-            Task.status == TaskStatus.IN_PROGRESS,
-            Task.pipeline_stage.notin_([TaskPipelineStage.COMPLETE, TaskPipelineStage.NONE, None])
-        ).all()
+        now = datetime.now(timezone.utc)
+
+        # Find tasks that might be stuck (IN_PROGRESS but no recent activity).
+        # Only the columns the timing checks need; full rows are loaded for
+        # the tasks that get blocked or retried.
+        not_stuck = self.NOT_STUCK_STAGES
+        stuck_rows = self.db.execute(lambda_stmt(
+            lambda: select(Task.id, Task.status, Task.updated_at, Task.created_at).where(
+                Task.status == TaskStatus.IN_PROGRESS,
+                Task.pipeline_stage.notin_(not_stuck)
+            )
+        )).all()
+        if not stuck_rows:
+            return actions
 
-        for task in stuck_tasks:
-            task_key = task.id
+        # Retry counters live in the database so a daemon restart does not
+        # reset them; load the whole batch's state in one query
+        states = {
+            state.task_id: state
+            for state in self.db.query(TaskRetryState).filter(
+                TaskRetryState.task_id.in_([row.id for row in stuck_rows])
+            )
+        }
 
-            # Get or create retry tracker entry
-            if task_key not in self._retry_tracker:
-                self._retry_tracker[task_key] = {
-                    "count": 0,
-                    "last_attempt": task.updated_at or task.created_at
-                }
+        for row in stuck_rows:
+            # Get or create retry state
+            state = states.get(row.id)
+            if state is None:
+                state = TaskRetryState(
+                    task_id=row.id,
+                    count=0,
+                    last_attempt=row.updated_at or row.created_at
+                )
+                self.db.add(state)
 
-            tracker = self._retry_tracker[task_key]
-            last_attempt = tracker["last_attempt"]
+            last_attempt = state.last_attempt
 
             # Check if enough time has passed for a retry
             if last_attempt:
+                if last_attempt.tzinfo is None:
+                    last_attempt = last_attempt.replace(tzinfo=timezone.utc)
                 time_since = (now - last_attempt).total_seconds()
                 if time_since < self.RETRY_INTERVAL_SECONDS:
                     continue  # Not time yet
 
             # Check if we've exceeded max retries
-            if tracker["count"] >= self.MAX_RETRIES:
+            if state.count >= self.MAX_RETRIES:
                 # Mark task as blocked after max retries
-                if task.status != TaskStatus.BLOCKED:
+                if row.status != TaskStatus.BLOCKED:
+                    task = self.db.get(Task, row.id)
                     task.status = TaskStatus.BLOCKED
-                    self.db.commit()
                     actions.append({
                         "action": "blocked",
                         "task_id": task.id,
@@ -953,13 +1297,14 @@ class TaskOrchestrator:
                     })
                     log_event(self.db, "director", "block_task", "task", task.id, {
                         "reason": "max_retries_exceeded",
-                        "retries": tracker["count"]
-                    })
+                        "retries": state.count
+                    }, commit=False)
                 continue
 
-            # Retry: update tracker and actually trigger agent
-            tracker["count"] += 1
-            tracker["last_attempt"] = now
+            # Retry: update retry state and actually trigger agent
+            state.count += 1
+            state.last_attempt = now
+            task = self.db.get(Task, row.id)
 
             # Actually trigger the agent for retry
             success, msg, run_id = self.director.trigger_agent_for_task(task)
@@ -968,7 +1313,7 @@ class TaskOrchestrator:
                 "action": "retry",
                 "task_id": task.id,
                 "task_ref": task.task_id,
-                "attempt": tracker["count"],
+                "attempt": state.count,
                 "max_retries": self.MAX_RETRIES,
                 "stage": task.pipeline_stage.value if task.pipeline_stage else "none",
                 "run_id": run_id if success else None,
@@ -976,11 +1321,14 @@ class TaskOrchestrator:
             })
 
             log_event(self.db, "director", "retry_task", "task", task.id, {
-                "attempt": tracker["count"],
+                "attempt": state.count,
                 "stage": task.pipeline_stage.value if task.pipeline_stage else "none",
                 "triggered": success,
                 "run_id": run_id if success else None
-            })
+            }, commit=False)
+
+        # One commit for retry state and tasks blocked in this pass
+        self.db.commit()
 
         return actions
 
@@ -1009,35 +1357,83 @@ class TaskOrchestrator:
             "blocked": []
         }
 
-        # 1. Enrich tasks missing acceptance criteria
-        enriched = self.enrich_incomplete_tasks()
-        result["enriched"] = enriched
-
-        # 2. Check for tasks that can be advanced (have passing reports)
-        advanced = self.check_and_advance_stuck_tasks()
-        for action in advanced:
-            result["advanced"].append(action)
-
-        # 3. Auto-start backlog tasks (move to DEV stage)
-        started = self.auto_start_backlog_tasks()
-        for action in started:
-            result["started"].append(action)
-
-        # 4. Trigger agents for tasks that need work
-        if auto_trigger_agents:
+        # DEV count handed from the advance step to auto-start; never reuse
+        # one left over from a previous cycle that skipped auto-start
+        self._dev_count = None
+
+        # One GROUP BY up front; steps with no matching tasks are skipped
+        snapshot = CycleSnapshot(self.db)
+        open_statuses = (TaskStatus.BACKLOG, TaskStatus.IN_PROGRESS)
+        in_progress = (TaskStatus.IN_PROGRESS,)
+        started = []
+
+        # Enrichment only writes acceptance criteria, which steps 2-3 never read,
+        # so it runs on a worker thread (own Session) while they run here
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            enrich_future = None
+            if snapshot.has(open_statuses, self.ENRICH_STAGES):
+                enrich_future = executor.submit(self._run_isolated, "enrich_incomplete_tasks")
+
+            # 2. Check for tasks that can be advanced (have passing reports)
+            if snapshot.has(in_progress, self.ADVANCE_STAGES):
+                advanced = self.check_and_advance_stuck_tasks()
+                for action in advanced:
+                    result["advanced"].append(action)
+
+            # 3. Auto-start backlog tasks (move to DEV stage)
+            if snapshot.has((TaskStatus.BACKLOG,), (TaskPipelineStage.NONE,)):
+                started = self.auto_start_backlog_tasks()
+                for action in started:
+                    result["started"].append(action)
+
+            # 1. Enrich tasks missing acceptance criteria
+            if enrich_future:
+                result["enriched"] = enrich_future.result()
+
+        if enrich_future:
+            # The enrich worker committed on its own Session; drop our stale copies
+            # so readiness checks below see the new criteria
+            self.db.expire_all()
+
+        # 4. Trigger agents for tasks that need work (started tasks are now in DEV)
+        if auto_trigger_agents and (started or snapshot.has(in_progress, self.TRIGGER_STAGES)):
             triggered = self.trigger_agents_for_ready_tasks()
             result["triggered"] = triggered
 
         # 5. Retry stuck tasks
-        retried = self.retry_stuck_tasks()
+        retried = []
+        if started or snapshot.has(in_progress, self.RETRY_STAGES):
+            retried = self.retry_stuck_tasks()
         for action in retried:
             if action["action"] == "retry":
                 result["retried"].append(action)
             elif action["action"] == "blocked":
                 result["blocked"].append(action)
 
+        audit_buffer.flush()
         return result
 
+    def _cached_readiness(self, task: Task) -> Tuple[bool, List[str]]:
+        """validate_task_readiness, reused until the task's updated_at changes."""
+        cached = self._readiness_cache.get(task.id)
+        if cached and cached[0] == task.updated_at:
+            return cached[1]
+        readiness = self.director.validate_task_readiness(task)
+        self._readiness_cache[task.id] = (task.updated_at, readiness)
+        return readiness
+
+    def _run_isolated(self, method_name: str, *args):
+        """Run an orchestrator step on its own Session.
+
+        SQLAlchemy Sessions are not thread-safe, so the worker thread in
+        run_cycle gets a dedicated Session on the same engine.
+        """
+        db = Session(bind=self.db.get_bind(), autoflush=False)
+        try:
+            return getattr(TaskOrchestrator(db), method_name)(*args)
+        finally:
+            db.close()
+
     def enrich_incomplete_tasks(self, max_tasks: int = 5) -> List[Dict]:
         """Find and enrich tasks missing acceptance criteria.
 
@@ -1045,19 +1441,22 @@ class TaskOrchestrator:
         """
         enriched = []
 
-        # Find tasks without acceptance criteria
-        tasks = self.db.query(Task).filter(
+        # Find tasks without acceptance criteria; only id + criteria are read
+        # for the scan, full rows are loaded for the tasks that need enrichment
+        candidates = self.db.query(Task.id, Task.acceptance_criteria).filter(
             Task.status.in_([TaskStatus.BACKLOG, TaskStatus.IN_PROGRESS]),
             Task.pipeline_stage != TaskPipelineStage.COMPLETE
         ).limit(max_tasks * 2).all()  # Get more than needed to filter
 
-        count = 0
-        for task in tasks:
-            if count >= max_tasks:
-                break
+        # Check if task needs enrichment
+        task_ids = [task_id for task_id, criteria in candidates if not criteria][:max_tasks]
+        if not task_ids:
+            return enriched
+        tasks_by_id = {task.id: task for task in self.db.query(Task).filter(Task.id.in_(task_ids))}
 
-            # Check if task needs enrichment
-            if not task.acceptance_criteria or len(task.acceptance_criteria) == 0:
+        for task_id in task_ids:
+            task = tasks_by_id.get(task_id)
+            if task is not None:
                 modified, msg = self.director.enrich_task(task)
                 if modified:
                     enriched.append({
@@ -1066,17 +1465,20 @@ class TaskOrchestrator:
                         "title": task.title,
                         "message": msg
                     })
-                    count += 1
+
+        if enriched:
+            self.db.commit()
 
         return enriched
 
-    def trigger_agents_for_ready_tasks(self, max_triggers: int = 1) -> List[Dict]:
+    def trigger_agents_for_ready_tasks(self, max_triggers: int = 5) -> List[Dict]:
         """Trigger agents for tasks that are ready but not being worked on.
 
         Only triggers if the task doesn't have an active run already.
 
         Args:
-            max_triggers: Maximum number of agents to trigger per cycle (default 1 to avoid overload)
+            max_triggers: Maximum number of agents to trigger per cycle; at most
+                one per project, since a project's new run blocks its other tasks
 
         Returns list of tasks that had agents triggered.
         """
@@ -1084,82 +1486,130 @@ class TaskOrchestrator:
 
         # Find tasks that are IN_PROGRESS but don't have an active run
         # or have a run that's in a failed/stuck state
-        # Include PM stage for planning/scoping work
         tasks = self.db.query(Task).filter(
             Task.status == TaskStatus.IN_PROGRESS,
-            Task.pipeline_stage.in_([
-                TaskPipelineStage.PM,
-                TaskPipelineStage.DEV,
-                TaskPipelineStage.QA,
-                TaskPipelineStage.SEC,
-                TaskPipelineStage.DOCS
-            ])
-        ).order_by(Task.priority.desc()).limit(max_triggers * 3).all()
-
-        count = 0
+            Task.pipeline_stage.in_(self.TRIGGER_STAGES)
+        ).order_by(Task.priority.desc(), Task.id.desc()).limit(max_triggers * 3).all()
+
+        # Forget readiness results for tasks that are no longer candidates
+        candidate_ids = {task.id for task in tasks}
+        self._readiness_cache = {
+            task_id: entry for task_id, entry in self._readiness_cache.items()
+            if task_id in candidate_ids
+        }
+
+        # Check which candidate projects already have an active run
+        # NOTE: Task.run_id removed in refactor - check recent project runs instead
+        active_projects = self._projects_with_active_runs({task.project_id for task in tasks})
+
+        to_trigger = []
         for task in tasks:
-            if count >= max_triggers:
+            if len(to_trigger) >= max_triggers:
                 break
 
-            # Check if task already has an active run for its project
-            # NOTE: Task.run_id removed in refactor - check recent project runs instead
-            recent_runs = self.db.query(Run).filter(
-                Run.project_id == task.project_id,
-                Run.killed == False
-            ).order_by(Run.created_at.desc()).limit(3).all()
-
-            has_active_run = False
-            for run in recent_runs:
-                active_states = [
-                    RunState.PM, RunState.DEV, RunState.QA, RunState.SEC,
-                    RunState.DOCS, RunState.TESTING
-                ]
-                if run.state in active_states:
-                    # Check if this run has a failed report and is stale
-                    # Auto-kill runs with failed reports after 5 minutes
-                    latest_report = self.db.query(AgentReport).filter(
-                        AgentReport.run_id == run.id
-                    ).order_by(AgentReport.created_at.desc()).first()
-
-                    if latest_report and latest_report.status == ReportStatus.FAIL:
-                        from datetime import datetime, timedelta
-                        stale_threshold = datetime.utcnow() - timedelta(minutes=5)
-                        if latest_report.created_at.replace(tzinfo=None) < stale_threshold:
-                            # Auto-kill stale failed run
-                            run.killed = True
-                            self.db.commit()
-                            log_event(self.db, "director", "auto_kill_run", "run", run.id, {
-                                "reason": "stale_failed_report",
-                                "report_status": "fail",
-                                "report_summary": latest_report.summary[:100] if latest_report.summary else None
-                            })
-                            continue  # Don't count this run as active
-
-                    has_active_run = True
-                    break
-
-            if has_active_run:
+            if task.project_id in active_projects:
                 continue  # Skip - already has active run for this project
 
             # Validate task is ready
-            is_ready, issues = self.director.validate_task_readiness(task)
+            is_ready, issues = self._cached_readiness(task)
             if not is_ready:
                 continue  # Skip - not ready
 
-            # Trigger agent
-            success, msg, run_id = self.director.trigger_agent_for_task(task)
-            if success:
-                triggered.append({
-                    "task_id": task.id,
-                    "task_ref": task.task_id,
-                    "title": task.title,
-                    "run_id": run_id,
-                    "stage": task.pipeline_stage.value if task.pipeline_stage else "none"
-                })
-                count += 1
+            to_trigger.append(task)
+            # The new run will be active; later tasks of this project wait for it
+            active_projects.add(task.project_id)
+
+        # Trigger agents, creating their runs in one batch. Summaries are built
+        # first because the run commit expires the task instances.
+        if to_trigger:
+            summaries = [{
+                "task_id": task.id,
+                "task_ref": task.task_id,
+                "title": task.title,
+                "stage": task.pipeline_stage.value if task.pipeline_stage else "none"
+            } for task in to_trigger]
+            for summary, (success, msg, run_id) in zip(
+                summaries, self.director.trigger_agents_for_tasks(to_trigger)
+            ):
+                if success:
+                    triggered.append({**summary, "run_id": run_id})
 
         return triggered
 
+    def _projects_with_active_runs(self, project_ids) -> set:
+        """Return ids of the projects that already have an active run.
+
+        Looks at each project's ACTIVE_RUNS_CHECKED newest live runs with two
+        queries for the whole batch: the runs, then each run's latest report.
+        Runs whose latest report failed more than STALE_FAILED_RUN_AGE ago
+        are auto-killed and don't count as active.
+        """
+        if not project_ids:
+            return set()
+
+        ranked_runs = select(
+            Run.id,
+            func.row_number().over(
+                partition_by=Run.project_id,
+                order_by=Run.created_at.desc()
+            ).label("recency")
+        ).where(
+            _id_list_filter(self.db, Run.project_id, project_ids),
+            Run.killed == False
+        ).subquery()
+
+        runs = self.db.query(Run).join(ranked_runs, ranked_runs.c.id == Run.id).filter(
+            ranked_runs.c.recency <= self.ACTIVE_RUNS_CHECKED,
+            Run.state.in_(self.ACTIVE_RUN_STATES)
+        ).order_by(Run.project_id, Run.created_at.desc()).all()
+        if not runs:
+            return set()
+
+        ranked_reports = select(
+            AgentReport.id,
+            func.row_number().over(
+                partition_by=AgentReport.run_id,
+                order_by=AgentReport.created_at.desc()
+            ).label("recency")
+        ).where(_id_list_filter(self.db, AgentReport.run_id, {run.id for run in runs})).subquery()
+
+        latest_reports = {
+            report.run_id: report
+            for report in self.db.query(AgentReport).join(
+                ranked_reports, ranked_reports.c.id == AgentReport.id
+            ).filter(ranked_reports.c.recency == 1)
+        }
+
+        active_projects = set()
+        killed = False
+        stale_threshold = datetime.utcnow() - self.STALE_FAILED_RUN_AGE
+        for run in runs:
+            if run.project_id in active_projects:
+                continue  # Newer active run already found for this project
+
+            # Check if this run has a failed report and is stale
+            # Auto-kill runs with failed reports older than STALE_FAILED_RUN_AGE
+            latest_report = latest_reports.get(run.id)
+            if latest_report and latest_report.status == ReportStatus.FAIL:
+                if latest_report.created_at.replace(tzinfo=None) < stale_threshold:
+                    # Auto-kill stale failed run
+                    run.killed = True
+                    killed = True
+                    log_event(self.db, "director", "auto_kill_run", "run", run.id, {
+                        "reason": "stale_failed_report",
+                        "report_status": "fail",
+                        "report_summary": latest_report.summary[:100] if latest_report.summary else None
+                    }, commit=False)
+                    continue  # Don't count this run as active
+
+            active_projects.add(run.project_id)
+
+        # One commit for all runs killed in this pass
+        if killed:
+            self.db.commit()
+
+        return active_projects
+
 
 def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30, auto_trigger: bool = True):
     """Run the Director as a background daemon.
@@ -1174,16 +1624,18 @@ def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30,
     - Retries stuck tasks (up to 3 times, 5 min intervals)
     - Blocks tasks that exceed retry limits
     - Updates database heartbeat for status monitoring
+    - Skips orchestration while DirectorSettings.enabled is false (paused)
 
     Args:
         db_getter: Function that returns a database session
         run_id: Optional specific run to monitor
-        poll_interval: Seconds between polls
+        poll_interval: Seconds between polls while there is work; idle cycles
+            back off up to TaskOrchestrator.MAX_POLL_INTERVAL
         auto_trigger: If True, automatically trigger agents for ready tasks
     """
     print(f"\n{'='*60}")
     print("DIRECTOR DAEMON STARTED (Active Orchestration Mode)")
-    print(f"Poll interval: {poll_interval}s")
+    print(f"Poll interval: {poll_interval}s (idle backoff up to {max(poll_interval, TaskOrchestrator.MAX_POLL_INTERVAL)}s)")
     print(f"Auto-trigger agents: {auto_trigger}")
     print(f"Max retries: {TaskOrchestrator.MAX_RETRIES}")
     print(f"Retry interval: {TaskOrchestrator.RETRY_INTERVAL_SECONDS}s")
@@ -1191,7 +1643,17 @@ def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30,
         print(f"Monitoring run: {run_id}")
     print(f"{'='*60}\n")
 
-    # Persistent orchestrator to track retries across cycles
+    # Grace period before the first cycle: a daemon being replaced may still
+    # be finishing a cycle, and both would count the same retries
+    if TaskOrchestrator.STARTUP_GRACE_SECONDS:
+        print(f"Startup grace period: {TaskOrchestrator.STARTUP_GRACE_SECONDS}s")
+        try:
+            time.sleep(TaskOrchestrator.STARTUP_GRACE_SECONDS)
+        except KeyboardInterrupt:
+            print("\nDirector daemon stopped.")
+            return
+
+    # Persistent orchestrator to keep per-cycle caches and poll backoff
     orchestrator = None
 
     while True:
@@ -1199,15 +1661,24 @@ def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30,
             db = next(db_getter())
 
             # Update heartbeat in database for status monitoring
+            settings = None
             try:
                 from app.models.director_settings import DirectorSettings
-                DirectorSettings.update_heartbeat(db)
+                settings = DirectorSettings.update_heartbeat(db)
             except Exception as e:
                 print(f"Failed to update heartbeat: {e}")
 
+            # Paused (enabled=False): keep the heartbeat so the UI shows the
+            # daemon alive, but skip orchestration and poll less often
+            if settings is not None and not settings.enabled:
+                paused_for = settings.paused_poll_interval()
+                db.close()
+                time.sleep(paused_for)
+                continue
+
             # Initialize or update orchestrator with fresh db session
             if orchestrator is None:
-                orchestrator = TaskOrchestrator(db)
+                orchestrator = TaskOrchestrator(db, poll_interval=poll_interval)
             else:
                 orchestrator.db = db
                 orchestrator.director.db = db
@@ -1254,6 +1725,9 @@ def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30,
 
             db.close()
 
+            # Poll sooner while there is work, back off while idle
+            sleep_for = orchestrator.next_poll_interval(total_actions > 0)
+
         except KeyboardInterrupt:
             print("\nDirector daemon stopped.")
             break
@@ -1261,5 +1735,6 @@ def run_director_daemon(db_getter, run_id: int = None, poll_interval: int = 30,
             import traceback
             print(f"Error in director daemon: {e}")
             traceback.print_exc()
+            sleep_for = poll_interval
 
-        time.sleep(poll_interval)
+        time.sleep(sleep_for)
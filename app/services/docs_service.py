@@ -4,11 +4,256 @@ Scans a project and generates/updates documentation automatically.
 """
 import os
 import ast
+import hashlib
+import multiprocessing
+import pickle
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_PARSE_MIN_FILES = 50
+
+# Directories never scanned for source files (caches, environments, build output)
+IGNORED_DIRS = frozenset({"__pycache__", ".venv", ".git", "node_modules", "build", "dist"})
+
+# Per-file parse results, reused while a file's mtime and size are unchanged
+PARSE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    ".cache", "docs_service"
+)
+# Bump when _DocVisitor's output changes so older cache entries are re-parsed
+PARSE_CACHE_VERSION = 1
+# Drop cache entries for deleted files every this many scans (per process)
+PARSE_CACHE_SWEEP_EVERY = 20
+_scan_count = 0
+
+
+def _pool_context():
+    """Process start method for parse workers.
+
+    Never fork: the server process runs background threads, and a forked
+    child can deadlock on a lock one of them held.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _walk_py_files(root: str, rel_root: str = "") -> Iterator[Tuple[str, str]]:
+    """Yield (path, rel_path) for Python files under root.
+
+    Uses os.scandir so file type checks come from the directory listing
+    instead of a stat per path, and prunes IGNORED_DIRS without entering them.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_root, entry.name) if rel_root else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        subdirs.append((entry.path, rel_path))
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry.path, rel_path
+    except OSError:
+        return  # Unreadable directory
+
+    for path, rel_path in subdirs:
+        yield from _walk_py_files(path, rel_path)
+
+
+def _parse_cache_file(path: str) -> str:
+    """Return the parse cache file for a source path."""
+    return os.path.join(PARSE_CACHE_DIR, hashlib.sha1(path.encode()).hexdigest() + ".pkl")
+
+
+def _read_parse_cache(path: str, rel_path: str) -> Optional[Tuple[List[Dict], List[Dict], List[Dict]]]:
+    """Return a file's cached (classes, functions, routes), or None on a miss.
+
+    Cache entries are stored per path with PARSE_CACHE_VERSION and the
+    file's mtime and size; a mismatch is a miss. A file that can't be stat'ed has nothing to parse.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [], [], []
+
+    try:
+        with open(_parse_cache_file(path), "rb") as f:
+            key, parsed = pickle.load(f)
+        # rel_path is part of the key: it is embedded in the results
+        if key == (PARSE_CACHE_VERSION, path, rel_path, st.st_mtime_ns, st.st_size):
+            return parsed
+    except Exception:
+        pass  # Missing or unreadable entry
+    return None
+
+
+def _parse_and_cache(path: str, rel_path: str) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Parse a file and store the result in the parse cache.
+
+    Module-level so it can run in a worker process.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [], [], []
+
+    parsed = _collect_definitions(path, rel_path)
+
+    # Write atomically so a concurrent reader never sees a partial pickle
+    cache_file = _parse_cache_file(path)
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(((PARSE_CACHE_VERSION, path, rel_path, st.st_mtime_ns, st.st_size), parsed), f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not cache parse result for {path}: {e}")
+
+    return parsed
+
+
+def _sweep_parse_cache() -> int:
+    """Remove parse cache entries whose source file no longer exists."""
+    removed = 0
+    try:
+        entries = list(os.scandir(PARSE_CACHE_DIR))
+    except OSError:
+        return removed
+
+    for entry in entries:
+        if not entry.name.endswith(".pkl"):
+            continue
+        try:
+            with open(entry.path, "rb") as f:
+                cached_path = pickle.load(f)[0][1]
+            if os.path.exists(cached_path):
+                continue
+        except Exception:
+            pass  # Unreadable entry: remove it too
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# Framework hints in file paths, checked by _infer_description
+_DESCRIPTION_HINT_RE = re.compile(r"flask|django|crud", re.IGNORECASE)
+
+# Files without a def/class keyword have nothing to collect and skip parsing
+_DEFINITION_RE = re.compile(rb"\b(?:def|class)\s")
+
+# Decorator attribute names that mark a Flask/FastAPI-style route
+_ROUTE_DECORATORS = frozenset({"route", "get", "post", "put", "delete"})
+
+# Nodes that can contain class or function definitions (match_case: 3.10+)
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler) + (
+    (ast.match_case,) if hasattr(ast, "match_case") else ()
+)
+
+
+def _fast_docstring(node: ast.AST) -> Optional[str]:
+    """ast.get_docstring, returning early for the common no-docstring case."""
+    body = node.body
+    if not (body and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)):
+        return None
+    return ast.get_docstring(node)
+
+
+class _DocVisitor(ast.NodeVisitor):
+    """Collect classes, module-level functions and routes in one pass.
+
+    Only statements are visited: expression subtrees, which make up most of
+    a module's nodes, are never entered.
+    """
+
+    def __init__(self, rel_path: str):
+        self.rel_path = rel_path
+        self.classes: List[Dict] = []
+        self.functions: List[Dict] = []
+        self.routes: List[Dict] = []
+        self._scope_depth = 0  # Enclosing class/function definitions
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_NODES):
+                self.visit(child)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        docstring = _fast_docstring(node) or ""
+        self.classes.append({
+            "name": node.name,
+            "file": self.rel_path,
+            "docstring": docstring[:200] if docstring else None,
+            "methods": [m.name for m in node.body if isinstance(m, ast.FunctionDef)]
+        })
+        self._visit_scope(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        module_level = self._scope_depth == 0
+        # Read once and shared by the function and route records
+        docstring = _fast_docstring(node) if module_level or node.decorator_list else None
+
+        # Module-level functions only
+        if module_level:
+            self.functions.append({
+                "name": node.name,
+                "file": self.rel_path,
+                "docstring": docstring[:200] if docstring else None,
+                "args": [arg.arg for arg in node.args.args if arg.arg != "self"]
+            })
+
+        # Look for Flask/Django routes
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call) and decorator.args:
+                if getattr(decorator.func, 'attr', None) in _ROUTE_DECORATORS:
+                    route_arg = decorator.args[0]
+                    route_path = route_arg.value if isinstance(route_arg, ast.Constant) else str(route_arg)
+                    self.routes.append({
+                        "path": route_path,
+                        "function": node.name,
+                        "file": self.rel_path,
+                        "docstring": docstring
+                    })
+
+        self._visit_scope(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_scope(node)
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+
+
+def _collect_definitions(path: str, rel_path: str) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Parse one Python file and collect its classes, functions and routes.
+
+    Files that can't be parsed yield empty lists.
+    """
+    visitor = _DocVisitor(rel_path)
+    try:
+        # ast.parse decodes bytes itself, honouring any PEP 263 coding cookie
+        with open(path, "rb") as f:
+            source = f.read()
+        if _DEFINITION_RE.search(source):
+            visitor.visit(ast.parse(source, filename=path))
+    except Exception:
+        # Skip files that can't be parsed; keep what was collected so far
+        pass
+
+    return visitor.classes, visitor.functions, visitor.routes
+
 
 class DocsService:
     """Service for generating and updating project documentation."""
@@ -29,53 +274,34 @@ class DocsService:
         }
 
         # Scan Python files
-        for py_file in self.project_path.rglob("*.py"):
-            if "__pycache__" in str(py_file) or ".venv" in str(py_file):
-                continue
-
-            rel_path = py_file.relative_to(self.project_path)
-            result["python_files"].append(str(rel_path))
-
-            try:
-                with open(py_file, "r") as f:
-                    tree = ast.parse(f.read())
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        docstring = ast.get_docstring(node) or ""
-                        result["classes"].append({
-                            "name": node.name,
-                            "file": str(rel_path),
-                            "docstring": docstring[:200] if docstring else None,
-                            "methods": [m.name for m in node.body if isinstance(m, ast.FunctionDef)]
-                        })
-                    elif isinstance(node, ast.FunctionDef) and not isinstance(node, ast.AsyncFunctionDef):
-                        # Top-level functions only
-                        if node.col_offset == 0:
-                            docstring = ast.get_docstring(node) or ""
-                            result["functions"].append({
-                                "name": node.name,
-                                "file": str(rel_path),
-                                "docstring": docstring[:200] if docstring else None,
-                                "args": [arg.arg for arg in node.args.args if arg.arg != "self"]
-                            })
-
-                    # Look for Flask/Django routes
-                    if isinstance(node, ast.FunctionDef):
-                        for decorator in node.decorator_list:
-                            if isinstance(decorator, ast.Call):
-                                if hasattr(decorator.func, 'attr'):
-                                    if decorator.func.attr in ('route', 'get', 'post', 'put', 'delete'):
-                                        if decorator.args:
-                                            route_path = ast.literal_eval(decorator.args[0]) if isinstance(decorator.args[0], ast.Constant) else str(decorator.args[0])
-                                            result["routes"].append({
-                                                "path": route_path,
-                                                "function": node.name,
-                                                "file": str(rel_path),
-                                                "docstring": ast.get_docstring(node)
-                                            })
-            except Exception as e:
-                pass  # Skip files that can't be parsed
+        global _scan_count
+        _scan_count += 1
+        if _scan_count % PARSE_CACHE_SWEEP_EVERY == 0:
+            _sweep_parse_cache()
+
+        py_files = list(_walk_py_files(str(self.project_path)))
+        result["python_files"] = [rel_path for _, rel_path in py_files]
+
+        # Cache hits are cheap reads; only misses need parsing
+        parsed = [_read_parse_cache(path, rel_path) for path, rel_path in py_files]
+        misses = [i for i, entry in enumerate(parsed) if entry is None]
+
+        # Parsing is CPU-bound; spread it over processes when many files changed
+        if len(misses) >= PARALLEL_PARSE_MIN_FILES:
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_pool_context()) as executor:
+                paths = [py_files[i][0] for i in misses]
+                rel_paths = [py_files[i][1] for i in misses]
+                fresh = executor.map(_parse_and_cache, paths, rel_paths, chunksize=16)
+                for i, entry in zip(misses, fresh):
+                    parsed[i] = entry
+        else:
+            for i in misses:
+                parsed[i] = _parse_and_cache(*py_files[i])
+
+        for classes, functions, routes in parsed:
+            result["classes"].extend(classes)
+            result["functions"].extend(functions)
+            result["routes"].extend(routes)
 
         return result
 
@@ -83,7 +309,7 @@ class DocsService:
         """Generate README.md content from project info."""
         name = project_name or self.project_path.name
 
-        readme = f"""# {name}
+        parts = [f"""# {name}
 
 ## Overview
 
@@ -118,37 +344,37 @@ main()
 
 ```
 {name}/
-"""
+"""]
         # Add file structure
         for py_file in sorted(project_info["python_files"])[:10]:
-            readme += f"├── {py_file}\n"
+            parts.append(f"├── {py_file}\n")
 
         if len(project_info["python_files"]) > 10:
-            readme += f"└── ... and {len(project_info['python_files']) - 10} more files\n"
+            parts.append(f"└── ... and {len(project_info['python_files']) - 10} more files\n")
 
-        readme += "```\n\n"
+        parts.append("```\n\n")
 
         # Add classes section if any
         if project_info["classes"]:
-            readme += "## Classes\n\n"
+            parts.append("## Classes\n\n")
             for cls in project_info["classes"][:10]:
-                readme += f"### `{cls['name']}`\n\n"
+                parts.append(f"### `{cls['name']}`\n\n")
                 if cls["docstring"]:
-                    readme += f"{cls['docstring']}\n\n"
+                    parts.append(f"{cls['docstring']}\n\n")
                 if cls["methods"]:
-                    readme += f"**Methods:** {', '.join(cls['methods'][:5])}\n\n"
+                    parts.append(f"**Methods:** {', '.join(cls['methods'][:5])}\n\n")
 
         # Add API section if routes found
         if project_info["routes"]:
-            readme += "## API Endpoints\n\n"
-            readme += "| Method | Path | Description |\n"
-            readme += "|--------|------|-------------|\n"
+            parts.append("## API Endpoints\n\n")
+            parts.append("| Method | Path | Description |\n")
+            parts.append("|--------|------|-------------|\n")
             for route in project_info["routes"][:20]:
                 desc = route["docstring"][:50] if route["docstring"] else route["function"]
-                readme += f"| GET/POST | `{route['path']}` | {desc} |\n"
-            readme += "\n"
+                parts.append(f"| GET/POST | `{route['path']}` | {desc} |\n")
+            parts.append("\n")
 
-        readme += f"""## Contributing
+        parts.append(f"""## Contributing
 
 1. Fork the repository
 2. Create a feature branch (`git checkout -b feature/amazing-feature`)
@@ -162,44 +388,48 @@ This project is licensed under the MIT License.
 
 ---
 *Documentation auto-generated on {datetime.now().strftime('%Y-%m-%d')}*
-"""
-        return readme
+""")
+        return "".join(parts)
 
     def generate_api_docs(self, project_info: Dict) -> str:
         """Generate API documentation from routes and functions."""
-        docs = """# API Reference
+        parts = ["""# API Reference
 
 This document describes the available API endpoints and functions.
 
-"""
+"""]
         if project_info["routes"]:
-            docs += "## Endpoints\n\n"
+            parts.append("## Endpoints\n\n")
             for route in project_info["routes"]:
-                docs += f"### `{route['path']}`\n\n"
-                docs += f"**Handler:** `{route['function']}`\n\n"
+                parts.append(f"### `{route['path']}`\n\n")
+                parts.append(f"**Handler:** `{route['function']}`\n\n")
                 if route["docstring"]:
-                    docs += f"{route['docstring']}\n\n"
-                docs += "---\n\n"
+                    parts.append(f"{route['docstring']}\n\n")
+                parts.append("---\n\n")
 
         if project_info["functions"]:
-            docs += "## Functions\n\n"
+            parts.append("## Functions\n\n")
             for func in project_info["functions"]:
-                docs += f"### `{func['name']}({', '.join(func['args'])})`\n\n"
-                docs += f"**File:** `{func['file']}`\n\n"
+                parts.append(f"### `{func['name']}({', '.join(func['args'])})`\n\n")
+                parts.append(f"**File:** `{func['file']}`\n\n")
                 if func["docstring"]:
-                    docs += f"{func['docstring']}\n\n"
-                docs += "---\n\n"
+                    parts.append(f"{func['docstring']}\n\n")
+                parts.append("---\n\n")
 
-        return docs
+        return "".join(parts)
 
     def _infer_description(self, project_info: Dict) -> str:
         """Try to infer project description from code."""
-        # Check for common patterns
-        if any("flask" in f.lower() for f in project_info["python_files"]):
+        # Check for common patterns: one scan over all paths, then by precedence
+        hints = {
+            hint.lower()
+            for hint in _DESCRIPTION_HINT_RE.findall("\n".join(project_info["python_files"]))
+        }
+        if "flask" in hints:
             return "A Flask-based web application."
-        if any("django" in f.lower() for f in project_info["python_files"]):
+        if "django" in hints:
             return "A Django-based web application."
-        if any("crud" in f.lower() for f in project_info["python_files"]):
+        if "crud" in hints:
             return "A CRUD (Create, Read, Update, Delete) application."
         if project_info["routes"]:
             return "A web application with REST API endpoints."
@@ -225,18 +455,19 @@ This document describes the available API endpoints and functions.
             # Scan project
             project_info = self.scan_project()
 
-            # Create docs directory if needed
-            if not self.docs_dir.exists():
+            # Create docs directory if needed (existence checked by the scan)
+            if not project_info["docs_dir_exists"]:
                 self.docs_dir.mkdir(parents=True)
                 result["files_created"].append("docs/")
 
             # Generate README.md
             readme_path = self.project_path / "README.md"
-            if not readme_path.exists() or force:
+            readme_exists = project_info["readme_exists"]
+            if not readme_exists or force:
                 readme_content = self.generate_readme(project_info)
                 with open(readme_path, "w") as f:
                     f.write(readme_content)
-                if readme_path.exists() and not force:
+                if not readme_exists:
                     result["files_created"].append("README.md")
                 else:
                     result["files_updated"].append("README.md")
@@ -246,11 +477,12 @@ This document describes the available API endpoints and functions.
             # Generate API docs if routes/functions found
             if project_info["routes"] or project_info["functions"]:
                 api_path = self.docs_dir / "API.md"
-                if not api_path.exists() or force:
+                api_exists = api_path.exists()
+                if not api_exists or force:
                     api_content = self.generate_api_docs(project_info)
                     with open(api_path, "w") as f:
                         f.write(api_content)
-                    if api_path.exists() and not force:
+                    if not api_exists:
                         result["files_created"].append("docs/API.md")
                     else:
                         result["files_updated"].append("docs/API.md")
@@ -0,0 +1,83 @@
+"""Git helpers shared by services that read repository state."""
+import os
+import re
+from typing import Dict, Optional
+
+
+# Full 40-char commit SHA as stored in .git refs
+GIT_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# repo_path -> (head_mtime, ref_path, ref_mtime, packed_mtime, sha)
+_git_head_cache: Dict[str, tuple] = {}
+
+
+def _mtime_ns(path: Optional[str]) -> Optional[int]:
+    """File mtime in nanoseconds, or None if the path is unset or missing."""
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_git_head(repo_path: str) -> Optional[str]:
+    """Resolve HEAD to a commit SHA by reading .git files directly.
+
+    Handles detached HEAD, loose refs, and packed-refs without forking git.
+    Results are cached until HEAD or the ref it points at changes. Returns
+    None for layouts this does not understand (e.g. worktrees, where .git is
+    a file) so the caller can fall back to `git rev-parse`.
+    """
+    git_dir = os.path.join(repo_path, ".git")
+    head_path = os.path.join(git_dir, "HEAD")
+    packed_path = os.path.join(git_dir, "packed-refs")
+
+    head_mtime = _mtime_ns(head_path)
+    if head_mtime is None:
+        return None
+
+    cached = _git_head_cache.get(repo_path)
+    if (
+        cached
+        and cached[0] == head_mtime
+        and cached[2] == _mtime_ns(cached[1])
+        and cached[3] == _mtime_ns(packed_path)
+    ):
+        return cached[4]
+
+    try:
+        with open(head_path) as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+
+    ref_path = None
+    sha = None
+    if head.startswith("ref: "):
+        ref = head[len("ref: "):]
+        ref_path = os.path.join(git_dir, ref)
+        try:
+            with open(ref_path) as f:
+                sha = f.read().strip()
+        except OSError:
+            # Ref not loose; look it up in packed-refs
+            try:
+                with open(packed_path) as f:
+                    for line in f:
+                        parts = line.split()
+                        if len(parts) == 2 and parts[1] == ref:
+                            sha = parts[0]
+                            break
+            except OSError:
+                return None
+    else:
+        sha = head
+
+    if not sha or not GIT_SHA_PATTERN.match(sha):
+        return None
+
+    _git_head_cache[repo_path] = (
+        head_mtime, ref_path, _mtime_ns(ref_path), _mtime_ns(packed_path), sha
+    )
+    return sha
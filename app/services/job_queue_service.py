@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from app.db import SessionLocal
 from app.models.llm_job import LLMJob, JobType, JobStatus, JobPriority
+from app.services.deployment_service import DEPLOY_FLOW_TIMEOUT_SECONDS
 
 
 class JobQueueService:
@@ -161,6 +162,40 @@ class JobQueueService:
             timeout=timeout
         )
 
+    def enqueue_deployment(
+        self,
+        deployment_id: int,
+        action: str = "deploy",
+        project_id: int = None,
+        priority: int = JobPriority.HIGH,
+        timeout: int = DEPLOY_FLOW_TIMEOUT_SECONDS
+    ) -> LLMJob:
+        """Add deployment execution to queue.
+
+        Args:
+            deployment_id: DeploymentHistory record created by start_deployment/rollback
+            action: "deploy" for the full deploy flow, "rollback" for a rollback
+            project_id: Optional project context
+            priority: Priority level
+            timeout: Timeout in seconds (default: worst case of the deploy
+                stages plus an auto-rollback)
+
+        Returns:
+            Created LLMJob record
+        """
+        request_data = {
+            "deployment_id": deployment_id,
+            "action": action
+        }
+
+        return self.enqueue_llm_request(
+            job_type=JobType.DEPLOYMENT.value,
+            request_data=request_data,
+            priority=priority,
+            project_id=project_id,
+            timeout=timeout
+        )
+
     # === Queue Management ===
 
     def get_next_job(self, job_types: List[str] = None) -> Optional[LLMJob]:
@@ -303,21 +338,21 @@ class JobQueueService:
         """
         db = self._get_db()
         try:
-            job = db.query(LLMJob).filter(
+            # Conditional UPDATE so workers polling the same job types never
+            # both start a job
+            started = db.query(LLMJob).filter(
                 LLMJob.id == job_id,
                 LLMJob.status == JobStatus.PENDING.value
-            ).first()
+            ).update({
+                LLMJob.status: JobStatus.RUNNING.value,
+                LLMJob.started_at: datetime.utcnow(),
+                LLMJob.worker_id: worker_id
+            }, synchronize_session=False)
+            db.commit()
 
-            if not job:
+            if not started:
                 return None
-
-            job.status = JobStatus.RUNNING.value
-            job.started_at = datetime.utcnow()
-            job.worker_id = worker_id
-
-            db.commit()
-            db.refresh(job)
-            return job
+            return db.get(LLMJob, job_id)
 
         except Exception as e:
             db.rollback()
@@ -18,6 +18,10 @@ from app.services.job_queue_service import JobQueueService
 
 logger = logging.getLogger(__name__)
 
+# Deploy workers; start_deployment and rollback keep one DEPLOYING record
+# per environment, so each worker is busy with a different environment
+DEPLOY_WORKER_COUNT = 3
+
 
 class JobWorker:
     """Background worker that processes queued jobs.
@@ -126,6 +130,8 @@ class JobWorker:
                 result = self._run_vision(job)
             elif job.job_type == JobType.AGENT_RUN.value:
                 result = self._run_agent(job)
+            elif job.job_type == JobType.DEPLOYMENT.value:
+                result = self._run_deployment(job)
             else:
                 raise ValueError(f"Unknown job type: {job.job_type}")
 
@@ -283,6 +289,37 @@ class JobWorker:
         except subprocess.TimeoutExpired:
             raise TimeoutError(f"Agent timed out after {timeout}s")
 
+    def _run_deployment(self, job: LLMJob) -> dict:
+        """Run a deployment or rollback started by the API."""
+        from app.services.deployment_service import DeploymentService
+
+        request = job.request_data or {}
+        deployment_id = request.get("deployment_id")
+        action = request.get("action", "deploy")
+
+        if not deployment_id:
+            raise ValueError("deployment_id is required for deployment jobs")
+
+        db = SessionLocal()
+        try:
+            service = DeploymentService(db)
+
+            if action == "rollback":
+                success, output = service.execute_deployment(deployment_id)
+                health_passed = None
+                if success:
+                    health_passed, _ = service.run_health_check(deployment_id)
+                return {
+                    "deployment_id": deployment_id,
+                    "deploy_success": success,
+                    "health_check_passed": health_passed
+                }
+
+            success, result = service.run_deployment_flow(deployment_id)
+            return result
+        finally:
+            db.close()
+
 
 # =============================================================================
 # Worker Manager - Singleton for managing all workers
@@ -337,6 +374,16 @@ class WorkerManager:
         )
         self.workers.append(vision_worker)
 
+        # Deploy Workers - handle deployments and rollbacks, so a long
+        # deploy to one environment doesn't hold up the others
+        for i in range(1, DEPLOY_WORKER_COUNT + 1):
+            deploy_worker = JobWorker(
+                worker_id=f"deploy-{i}",
+                job_types=[JobType.DEPLOYMENT.value],
+                poll_interval=1.0
+            )
+            self.workers.append(deploy_worker)
+
         # Start all workers
         for worker in self.workers:
             worker.start()
@@ -1,7 +1,7 @@
 """Quality requirements loader for QA automation."""
 import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 from django.conf import settings
 
@@ -12,19 +12,33 @@ DEFAULT_QUALITY_REQUIREMENTS_PATH = os.getenv(
 )
 
 
+# Parsed requirement files: {path: (mtime_ns, requirements)}
+_REQUIREMENTS_CACHE: Dict[str, Tuple[int, List[Dict]]] = {}
+
+
 def load_quality_requirements(path: str = None) -> List[Dict]:
     """Load quality requirements from JSON file.
 
     Returns a list of requirement dicts. If file is missing or invalid, returns empty list.
+    Parsed files are cached until their mtime changes; the returned list is
+    shared between callers and must not be mutated.
     """
     path = path or DEFAULT_QUALITY_REQUIREMENTS_PATH
     try:
-        if not os.path.exists(path):
-            return []
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+
+    cached = _REQUIREMENTS_CACHE.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
         with open(path, "r") as f:
             data = json.load(f)
-        if isinstance(data, list):
-            return data
+        requirements = data if isinstance(data, list) else []
     except Exception:
         return []
-    return []
+
+    _REQUIREMENTS_CACHE[path] = (mtime_ns, requirements)
+    return requirements
@@ -3,6 +3,7 @@ import os
 import subprocess
 from datetime import datetime
 from typing import Optional, Tuple, List
+from sqlalchemy import func
 from app.models.run import Run, RunState, VALID_TRANSITIONS
 from app.models.project import Project
 from app.models.report import AgentReport, AgentRole, ReportStatus
@@ -18,6 +19,19 @@ from app.services.claim_service import ClaimService
 class RunService:
     """Service for managing run state transitions and gate enforcement."""
 
+    # Pipeline position of each task stage, for "is this task behind" checks
+    STAGE_RANK = {
+        stage: rank for rank, stage in enumerate([
+            TaskPipelineStage.NONE,
+            TaskPipelineStage.PM,
+            TaskPipelineStage.DEV,
+            TaskPipelineStage.QA,
+            TaskPipelineStage.SEC,
+            TaskPipelineStage.DOCS,
+            TaskPipelineStage.COMPLETE,
+        ])
+    }
+
     def __init__(self, db):
         self.db = db
 
@@ -29,6 +43,14 @@ class RunService:
         - Creates initial commit if repo is empty
         - Checks if claims are required (if require_claims is True)
         """
+        return self.create_runs(project_id, [name], actor=actor)[0]
+
+    def create_runs(self, project_id: int, names: List[str], actor: str = "human") -> List[Run]:
+        """Create several runs for a project in a single transaction.
+
+        The project lookup, claims check and git initialization happen once
+        for the batch; see create_run for what each of them does.
+        """
         # Get project to check/init git repo
         project = self.db.query(Project).filter(Project.id == project_id).first()
 
@@ -47,37 +69,44 @@ class RunService:
         if project and project.repo_path:
             git_info = self._ensure_git_repo(project.repo_path, project)
 
-        run = Run(project_id=project_id, name=name, state=RunState.PM)
-        self.db.add(run)
+        runs = [Run(project_id=project_id, name=name, state=RunState.PM) for name in names]
+        self.db.add_all(runs)
+        self.db.flush()
+
+        for run in runs:
+            log_event(
+                self.db,
+                actor=actor,
+                action="create",
+                entity_type="run",
+                entity_id=run.id,
+                details={
+                    "name": run.name,
+                    "initial_state": "pm",
+                    "git_initialized": git_info.get("initialized", False),
+                    "git_branch": git_info.get("branch"),
+                    "git_remote": git_info.get("remote_url")
+                },
+                commit=False
+            )
+        run_ids = [run.id for run in runs]
         self.db.commit()
-        self.db.refresh(run)
-
-        log_event(
-            self.db,
-            actor=actor,
-            action="create",
-            entity_type="run",
-            entity_id=run.id,
-            details={
-                "name": name,
-                "initial_state": "pm",
-                "git_initialized": git_info.get("initialized", False),
-                "git_branch": git_info.get("branch"),
-                "git_remote": git_info.get("remote_url")
-            }
-        )
+        # Reload the batch in one SELECT instead of one per expired run
+        if len(runs) > 1:
+            self.db.query(Run).filter(Run.id.in_(run_ids)).all()
 
         # Dispatch webhook - new run created, PM agent should start
-        dispatch_webhook(EVENT_RUN_CREATED, {
-            "run_id": run.id,
-            "project_id": project_id,
-            "name": name,
-            "state": "pm",
-            "next_agent": "pm",
-            "git_info": git_info
-        })
+        for run in runs:
+            dispatch_webhook(EVENT_RUN_CREATED, {
+                "run_id": run.id,
+                "project_id": project_id,
+                "name": run.name,
+                "state": "pm",
+                "next_agent": "pm",
+                "git_info": git_info
+            })
 
-        return run
+        return runs
 
     def _ensure_git_repo(self, repo_path: str, project: Project = None) -> dict:
         """Ensure a git repository exists at the given path.
@@ -832,16 +861,7 @@ secrets.yaml
         if not target_stage:
             return 0  # No task stage update for this run state
 
-        # Stage ordering for comparison
-        stage_order = [
-            TaskPipelineStage.NONE,
-            TaskPipelineStage.DEV,
-            TaskPipelineStage.QA,
-            TaskPipelineStage.SEC,
-            TaskPipelineStage.DOCS,
-            TaskPipelineStage.COMPLETE
-        ]
-        target_index = stage_order.index(target_stage)
+        target_index = self.STAGE_RANK[target_stage]
 
         # Get all tasks linked to this run's project
         # NOTE: Task.run_id removed in refactor - get tasks by project
@@ -850,7 +870,7 @@ secrets.yaml
         updated = 0
         for task in tasks:
             current_stage = task.pipeline_stage or TaskPipelineStage.NONE
-            current_index = stage_order.index(current_stage)
+            current_index = self.STAGE_RANK[current_stage]
 
             # Only advance if behind target
             if current_index < target_index:
@@ -940,20 +960,24 @@ secrets.yaml
             return {"error": "Run not found"}
 
         # NOTE: Task.run_id removed in refactor - get tasks by project
-        tasks = self.db.query(Task).filter(Task.project_id == run.project_id).all()
+        # Count by stage in the database rather than loading every task row
+        rows = self.db.query(Task.pipeline_stage, func.count(Task.id)).filter(
+            Task.project_id == run.project_id
+        ).group_by(Task.pipeline_stage).all()
 
-        # Count by stage
         stage_counts = {stage.value: 0 for stage in TaskPipelineStage}
-        for task in tasks:
-            stage = task.pipeline_stage or TaskPipelineStage.NONE
-            stage_counts[stage.value] += 1
+        for stage, count in rows:
+            stage = stage or TaskPipelineStage.NONE
+            stage_counts[stage.value] += count
 
-        total = len(tasks)
-        completed = stage_counts.get("complete", 0)
+        total = sum(stage_counts.values())
+        completed = stage_counts[TaskPipelineStage.COMPLETE.value]
         progress_pct = (completed / total * 100) if total > 0 else 0
 
         # Check if ready to advance based on current run state
-        ready_to_advance = self._check_tasks_ready_for_advance(run, tasks)
+        ready_to_advance = self._check_tasks_ready_for_advance(
+            run, [TaskPipelineStage(value) for value, count in stage_counts.items() if count]
+        )
 
         return {
             "run_id": run_id,
@@ -964,14 +988,18 @@ secrets.yaml
             "ready_to_advance": ready_to_advance
         }
 
-    def _check_tasks_ready_for_advance(self, run: Run, tasks: list) -> bool:
+    def _check_tasks_ready_for_advance(self, run: Run, stages: list) -> bool:
         """Check if all tasks have completed the current run stage.
 
         For run at DEV: All tasks should be at QA or beyond
         For run at QA: All tasks should be at SEC or beyond
         For run at SEC: All tasks should be at DOCS or beyond
+
+        Args:
+            run: Run whose state sets the minimum task stage
+            stages: Distinct pipeline stages the run's tasks are in
         """
-        if not tasks:
+        if not stages:
             return True  # No tasks = no blockers
 
         # Map run state to minimum required task stage
@@ -986,20 +1014,10 @@ secrets.yaml
         if not min_stage:
             return True  # Other states don't need task checks
 
-        # Stage ordering for comparison
-        stage_order = [
-            TaskPipelineStage.NONE,
-            TaskPipelineStage.DEV,
-            TaskPipelineStage.QA,
-            TaskPipelineStage.SEC,
-            TaskPipelineStage.DOCS,
-            TaskPipelineStage.COMPLETE
-        ]
-        min_index = stage_order.index(min_stage)
+        min_index = self.STAGE_RANK[min_stage]
 
-        for task in tasks:
-            task_stage = task.pipeline_stage or TaskPipelineStage.NONE
-            if stage_order.index(task_stage) < min_index:
-                return False  # Task hasn't reached minimum stage
+        for stage in stages:
+            if self.STAGE_RANK[stage] < min_index:
+                return False  # Some task hasn't reached minimum stage
 
         return True
@@ -54,9 +54,10 @@ class TaskQueueService:
             Task.status == TaskStatus.BACKLOG
         ).order_by(Task.priority.desc()).all()
 
-        # Find first unblocked task
+        # Find first unblocked task (one dependency query for all candidates)
+        blocked = Task.blocked_ids(self.session, candidates)
         for task in candidates:
-            if not task.is_blocked(self.session):
+            if task.id not in blocked:
                 return task
 
         return None
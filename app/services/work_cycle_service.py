@@ -7,17 +7,27 @@ This service generates context for each agent run by:
 4. Optionally writing to _spec/WORK_CYCLE.md for file-based interface
 """
 import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 
-from app.models.run import Run, RunState
-from app.models.task import Task
-from app.models.report import AgentReport, AgentRole
-from app.models.project import Project
+from app.services.async_writer import get_async_writer
+from app.services.git_utils import read_git_head
 
+# Models are imported inside the functions that query them, so the git
+# and formatting helpers can be imported without loading the ORM/database layer.
+
+
+# Built contexts: {key: (built_at, context)}. The key covers the run's
+# reports, the project's task writes and the repo HEAD; the TTL bounds
+# staleness of the uncommitted diff, which the key does not cover.
+_CONTEXT_CACHE: Dict[tuple, Tuple[float, str]] = {}
+CONTEXT_CACHE_TTL_SECONDS = 30
+CONTEXT_CACHE_MAX_ENTRIES = 256
 
 # Pipeline order for context building
 PIPELINE_ORDER = ["pm", "dev", "qa", "security", "docs"]
@@ -61,49 +71,228 @@ ROLE_DELIVERABLES = {
     ],
 }
 
+# Deliverables rendered as markdown bullet lists, built once per role
+_ROLE_DELIVERABLE_BLOCKS = {
+    role: "\n".join(f"- {d}" for d in deliverables)
+    for role, deliverables in ROLE_DELIVERABLES.items()
+}
+_DEFAULT_DELIVERABLE_BLOCK = "- Complete your role's responsibilities"
+
+# Failure report detail keys listed first in a loopback, in display order
+_LOOPBACK_KEYS = ('failing_tests', 'failures', 'errors', 'issues',
+                  'vulnerabilities', 'findings', 'bugs')
+# Keys left out of the "other details" listing
+_LOOPBACK_EXCLUDE = frozenset(_LOOPBACK_KEYS) | {'status', 'summary'}
+
+
+GIT_TIMEOUT_SECONDS = 10
+GIT_DIFF_STAT_COMMAND = ["git", "diff", "--stat", "HEAD"]
+
+# Git output per repo, reused across the back-to-back context builds of one
+# agent start (prompt and file): {(kind, repo_path, limit): (fetched_at, value)}
+_GIT_CACHE: Dict[tuple, Tuple[float, object]] = {}
+GIT_CACHE_TTL_SECONDS = 5
+
+
+def _git_cache_get(key: tuple):
+    """Return a cached git result younger than the TTL, else None."""
+    cached = _GIT_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < GIT_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _git_cache_put(key: tuple, value) -> None:
+    _GIT_CACHE[key] = (time.monotonic(), value)
+
+
+# Commit lists by the HEAD they were read at: {(repo_path, head_sha, limit): commits}.
+# History below a commit never changes, so entries only leave when full.
+_COMMITS_BY_HEAD: Dict[tuple, List[Dict]] = {}
+COMMITS_BY_HEAD_MAX_ENTRIES = 256
+
+
+def _remember_commits(repo_path: str, head: Optional[str], limit: int, commits: List[Dict]) -> None:
+    """Store commits under the HEAD read before `git log` ran.
+
+    Skipped if HEAD moved in between (the newest commit doesn't match).
+    """
+    if not head or not commits or commits[0]["sha"] != head[:8]:
+        return
+    if len(_COMMITS_BY_HEAD) >= COMMITS_BY_HEAD_MAX_ENTRIES:
+        _COMMITS_BY_HEAD.pop(next(iter(_COMMITS_BY_HEAD)), None)
+    _COMMITS_BY_HEAD[(repo_path, head, limit)] = commits
+
+
+def _git_log_command(limit: int) -> List[str]:
+    """Return the `git log` command for the last `limit` commits.
+
+    Fields and commits are NUL-terminated, so a `|` or newline in a
+    subject can't split a record.
+    """
+    return ["git", "log", "-z", f"-{limit}", "--format=%H%x00%s%x00%an%x00%ai"]
+
+
+def _parse_commits(output: bytes) -> List[Dict]:
+    """Parse raw `_git_log_command()` output into commit dicts."""
+    fields = output.split(b"\0")
+    return [
+        {
+            "sha": fields[i][:8].decode("ascii"),
+            "message": fields[i + 1].decode("utf-8", "replace"),
+            "author": fields[i + 2].decode("utf-8", "replace"),
+            "date": fields[i + 3].decode("ascii"),
+        }
+        for i in range(0, len(fields) - 3, 4)
+    ]
+
 
 def get_recent_commits(repo_path: str, limit: int = 5) -> List[Dict]:
-    """Get recent git commits from the repository."""
+    """Get recent git commits from the repository (cached briefly per repo)."""
+    key = ("log", repo_path, limit)
+    commits = _git_cache_get(key)
+    if commits is not None:
+        return commits
+
+    head = read_git_head(repo_path)
+    commits = _COMMITS_BY_HEAD.get((repo_path, head, limit))
+    if commits is not None:
+        _git_cache_put(key, commits)
+        return commits
+
     commits = []
     try:
         result = subprocess.run(
-            ["git", "log", f"-{limit}", "--format=%H|%s|%an|%ai"],
+            _git_log_command(limit),
             cwd=repo_path,
             capture_output=True,
-            text=True,
-            timeout=10
+            timeout=GIT_TIMEOUT_SECONDS
         )
         if result.returncode == 0:
-            for line in result.stdout.strip().split("\n"):
-                if line and "|" in line:
-                    parts = line.split("|", 3)
-                    if len(parts) >= 4:
-                        commits.append({
-                            "sha": parts[0][:8],
-                            "message": parts[1],
-                            "author": parts[2],
-                            "date": parts[3]
-                        })
+            commits = _parse_commits(result.stdout)
     except Exception:
         pass
+    _remember_commits(repo_path, head, limit, commits)
+    _git_cache_put(key, commits)
     return commits
 
 
 def get_git_diff_summary(repo_path: str) -> str:
-    """Get summary of uncommitted changes."""
+    """Get summary of uncommitted changes (cached briefly per repo)."""
+    key = ("diff", repo_path, None)
+    summary = _git_cache_get(key)
+    if summary is not None:
+        return summary
+
+    summary = ""
+    try:
+        result = subprocess.run(
+            GIT_DIFF_STAT_COMMAND,
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT_SECONDS
+        )
+        if result.returncode == 0:
+            summary = result.stdout.strip()
+    except Exception:
+        pass
+    _git_cache_put(key, summary)
+    return summary
+
+
+def get_git_context(repo_path: str, limit: int = 5) -> Tuple[List[Dict], str]:
+    """Get recent commits and the uncommitted diff summary together.
+
+    Starts `git log` and `git diff --stat` at the same time so the context
+    build waits for the slower of the two instead of both in sequence.
+    Either part falls back to empty on failure, like get_recent_commits()
+    and get_git_diff_summary(), and shares their per-repo cache; only
+    the parts not cached are run.
+    """
+    log_key, diff_key = ("log", repo_path, limit), ("diff", repo_path, None)
+    commits, diff_summary = _git_cache_get(log_key), _git_cache_get(diff_key)
+    head = None
+    if commits is None:
+        # An unmoved HEAD means the same commits; only the diff needs git
+        head = read_git_head(repo_path)
+        commits = _COMMITS_BY_HEAD.get((repo_path, head, limit))
+        if commits is not None:
+            _git_cache_put(log_key, commits)
+    missing = [
+        (key, command)
+        for key, command, cached in (
+            (log_key, _git_log_command(limit), commits),
+            (diff_key, GIT_DIFF_STAT_COMMAND, diff_summary),
+        )
+        if cached is None
+    ]
+    if not missing:
+        return commits, diff_summary
+
+    procs = []
+    try:
+        for _, command in missing:
+            procs.append(subprocess.Popen(
+                command,
+                cwd=repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            ))
+    except Exception:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+        return commits or [], diff_summary or ""
+
+    outputs = []
+    for proc in procs:
+        try:
+            stdout, _ = proc.communicate(timeout=GIT_TIMEOUT_SECONDS)
+            outputs.append(stdout if proc.returncode == 0 else b"")
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            outputs.append(b"")
+
+    for (key, _), output in zip(missing, outputs):
+        if key == log_key:
+            commits = _parse_commits(output)
+            _remember_commits(repo_path, head, limit, commits)
+            _git_cache_put(key, commits)
+        else:
+            diff_summary = output.decode("utf-8", "replace").strip()
+            _git_cache_put(key, diff_summary)
+    return commits, diff_summary
+
+
+def get_head_sha(repo_path: str) -> Optional[str]:
+    """Get the commit HEAD points to, or None if it can't be resolved.
+
+    Read from the .git files when possible; `git rev-parse` is the fallback.
+    """
+    head = read_git_head(repo_path)
+    if head:
+        return head
     try:
         result = subprocess.run(
-            ["git", "diff", "--stat", "HEAD"],
+            ["git", "rev-parse", "HEAD"],
             cwd=repo_path,
             capture_output=True,
             text=True,
-            timeout=10
+            timeout=GIT_TIMEOUT_SECONDS
         )
-        if result.returncode == 0 and result.stdout.strip():
+        if result.returncode == 0:
             return result.stdout.strip()
     except Exception:
         pass
-    return ""
+    return None
+
+
+def _strict_loading() -> bool:
+    """Whether unexpected lazy loads should raise (settings.STRICT_LOADING)."""
+    from django.conf import settings
+    return getattr(settings, "STRICT_LOADING", False)
 
 
 def build_work_cycle_context(
@@ -116,6 +305,10 @@ def build_work_cycle_context(
 ) -> str:
     """Build comprehensive work_cycle context from DB and git.
 
+    Agents re-request the same context during retries and loopbacks, so the
+    result is reused for CONTEXT_CACHE_TTL_SECONDS as long as the run's
+    reports, the project's tasks and the repository HEAD are unchanged.
+
     Args:
         db: SQLAlchemy session
         run_id: Current run ID
@@ -127,40 +320,117 @@ def build_work_cycle_context(
     Returns:
         Formatted context string for agent prompt
     """
-    # Get run and project
-    run = db.query(Run).filter(Run.id == run_id).first()
+    from app.models.run import Run
+    from app.models.report import AgentReport
+    from app.models.project import Project
+    from app.models.task import Task
+
+    # Task writes (start, enrich, loopback) bump updated_at; new tasks only
+    # have created_at, and the count catches deletions
+    project_tasks = Task.project_id == Run.project_id
+    task_count = db.query(func.count(Task.id)).filter(project_tasks).scalar_subquery()
+    latest_task_at = db.query(
+        func.max(func.coalesce(Task.updated_at, Task.created_at))
+    ).filter(project_tasks).scalar_subquery()
+
+    # One aggregate query for the run's repo, report and task state
+    state = db.query(
+        Project.repo_path, func.count(AgentReport.id), func.max(AgentReport.created_at),
+        task_count, latest_task_at
+    ).select_from(Run).join(
+        Project, Project.id == Run.project_id
+    ).outerjoin(
+        AgentReport, AgentReport.run_id == Run.id
+    ).filter(Run.id == run_id).group_by(Project.repo_path, Run.project_id).first()
+    if state is None:
+        # Missing run or project: nothing worth caching
+        return _build_work_cycle_context(db, run_id, role, task_id, include_raw_output, max_report_chars)
+
+    repo_path, report_count, latest_report_at, task_count, latest_task_at = state
+    key = (
+        run_id, role, task_id, include_raw_output, max_report_chars,
+        report_count, latest_report_at, task_count, latest_task_at,
+        get_head_sha(repo_path or "."),
+    )
+    now = time.monotonic()
+    cached = _CONTEXT_CACHE.get(key)
+    if cached and now - cached[0] < CONTEXT_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    context = _build_work_cycle_context(db, run_id, role, task_id, include_raw_output, max_report_chars)
+
+    if len(_CONTEXT_CACHE) >= CONTEXT_CACHE_MAX_ENTRIES:
+        for stale_key, (built_at, _) in list(_CONTEXT_CACHE.items()):
+            if now - built_at >= CONTEXT_CACHE_TTL_SECONDS:
+                _CONTEXT_CACHE.pop(stale_key, None)
+        if len(_CONTEXT_CACHE) >= CONTEXT_CACHE_MAX_ENTRIES:
+            _CONTEXT_CACHE.pop(next(iter(_CONTEXT_CACHE)), None)
+    _CONTEXT_CACHE[key] = (now, context)
+    return context
+
+
+def _build_work_cycle_context(
+    db: Session,
+    run_id: int,
+    role: str,
+    task_id: Optional[str],
+    include_raw_output: bool,
+    max_report_chars: int
+) -> str:
+    """Build the context without the cache; see build_work_cycle_context."""
+    from app.models.run import Run
+    from app.models.task import Task, TaskStatus
+    from app.models.report import AgentReport, AgentRole
+
+    # Get run with its project (joined) and agent reports (one batched query).
+    # raw_output is the largest column and is only rendered on request.
+    strict = _strict_loading()
+    project_loader = joinedload(Run.project)
+    reports_loader = selectinload(Run.reports)
+    if not include_raw_output:
+        reports_loader = reports_loader.defer(AgentReport.raw_output)
+    run_query = db.query(Run)
+    if strict:
+        project_loader = project_loader.raiseload("*")
+        reports_loader = reports_loader.raiseload("*")
+        run_query = run_query.options(raiseload("*"))
+    run = run_query.options(
+        project_loader,
+        reports_loader
+    ).filter(Run.id == run_id).first()
     if not run:
         return f"# WorkCycle Context\nRun {run_id} not found."
 
-    project = db.query(Project).filter(Project.id == run.project_id).first()
+    project = run.project
     if not project:
         return f"# WorkCycle Context\nProject not found for run {run_id}."
 
     # Get specific task or all tasks for this run's project
     # NOTE: Task.run_id removed in refactor - get tasks from project
     if task_id:
+        # Left lazy even in strict mode: the detailed view walks the parent
+        # and inherited requirements chain, which has no fixed depth
         task = db.query(Task).filter(
             Task.project_id == run.project_id,
             Task.task_id == task_id
         ).first()
         tasks = [task] if task else []
     else:
-        # Get in-progress tasks for this project
-        from app.models.task import TaskStatus
-        tasks = db.query(Task).filter(
+        # Get in-progress tasks for this project (summary view reads columns only)
+        task_query = db.query(Task)
+        if strict:
+            task_query = task_query.options(raiseload("*"))
+        tasks = task_query.filter(
             Task.project_id == run.project_id,
             Task.status == TaskStatus.IN_PROGRESS
         ).all()
 
-    # Get all agent reports for this run, ordered by creation
-    reports = db.query(AgentReport).filter(
-        AgentReport.run_id == run_id
-    ).order_by(AgentReport.created_at.asc()).all()
+    # All agent reports for this run, ordered by creation
+    reports = sorted(run.reports, key=lambda report: (report.created_at, report.id))
 
     # Get recent git commits
     repo_path = project.repo_path or "."
-    commits = get_recent_commits(repo_path)
-    diff_summary = get_git_diff_summary(repo_path)
+    commits, diff_summary = get_git_context(repo_path)
 
     # Build context sections
     sections = []
@@ -210,10 +480,9 @@ and {loopback_stage} found problems. Your job is to FIX these specific issues.
             # Handle different report formats
             if isinstance(details, dict):
                 # Look for common keys
-                for key in ['failing_tests', 'failures', 'errors', 'issues',
-                           'vulnerabilities', 'findings', 'bugs']:
-                    if key in details and details[key]:
-                        items = details[key]
+                for key in _LOOPBACK_KEYS:
+                    items = details.get(key)
+                    if items:
                         if isinstance(items, list):
                             for item in items:
                                 if isinstance(item, dict):
@@ -230,10 +499,8 @@ and {loopback_stage} found problems. Your job is to FIX these specific issues.
 
                 # Show any other details
                 for key, value in details.items():
-                    if key not in ['failing_tests', 'failures', 'errors', 'issues',
-                                  'vulnerabilities', 'findings', 'bugs', 'status', 'summary']:
-                        if value:
-                            sections.append(f"- **{key}**: {value}")
+                    if value and key not in _LOOPBACK_EXCLUDE:
+                        sections.append(f"- **{key}**: {value}")
             else:
                 sections.append(f"```\n{details}\n```")
 
@@ -360,9 +627,12 @@ and {loopback_stage} found problems. Your job is to FIX these specific issues.
             # Include raw output if requested (for deep context)
             if include_raw_output and report.raw_output:
                 output = report.raw_output
+                # Separate sections instead of one f-string: the final join
+                # copies the (possibly large) output once rather than twice
                 if len(output) > max_report_chars:
-                    output = f"[...truncated...]\n{output[-max_report_chars:]}"
-                sections.append(f"```\n{output}\n```")
+                    sections.extend(("```", "[...truncated...]", output[-max_report_chars:], "```"))
+                else:
+                    sections.extend(("```", output, "```"))
 
             sections.append("---")
     else:
@@ -380,10 +650,8 @@ and {loopback_stage} found problems. Your job is to FIX these specific issues.
         sections.append(f"## Uncommitted Changes\n```\n{diff_summary}\n```\n")
 
     # Role-specific deliverables
-    deliverables = ROLE_DELIVERABLES.get(role, ["Complete your role's responsibilities"])
     sections.append("## Your Deliverables")
-    for d in deliverables:
-        sections.append(f"- {d}")
+    sections.append(_ROLE_DELIVERABLE_BLOCKS.get(role, _DEFAULT_DELIVERABLE_BLOCK))
     sections.append("")
 
     # Important reminders
@@ -438,7 +706,8 @@ def write_work_cycle_file(
         include_raw_output: Include full raw output
 
     Returns:
-        Path to written file
+        Path to the file, which is written in the background
+        (see app.services.async_writer)
     """
     context = build_work_cycle_context(db, run_id, role, task_id=task_id, include_raw_output=include_raw_output)
 
@@ -452,7 +721,10 @@ def write_work_cycle_file(
         filename = f"WORK_CYCLE_{run_id}.md"
 
     work_cycle_path = spec_dir / filename
-    work_cycle_path.write_text(context)
+
+    # The file backs up context agents also get in their prompt, so the disk
+    # write is buffered (atomic, skipped if unchanged) off the request path
+    get_async_writer().submit(work_cycle_path, context.encode())
 
     return str(work_cycle_path)
 
@@ -507,7 +779,7 @@ def get_work_cycle_for_prompt(
                 db, run_id, role, project_path,
                 task_id=task_id, include_raw_output=True
             )
-            print(f"Wrote work_cycle file: {filepath}")
+            print(f"Queued work_cycle file: {filepath}")
         except Exception as e:
             print(f"Warning: Could not write work_cycle file: {e}")
 
@@ -551,8 +823,9 @@ def create_work_cycle(
     from app.models.work_cycle import WorkCycle, WorkCycleStatus
     from app.models.task import Task
 
-    # Get task to auto-fill project_id if needed
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Get task to auto-fill project_id if needed; the project is joined in
+    # since the work_cycle file path comes from its repo_path
+    task = db.query(Task).options(joinedload(Task.project)).filter(Task.id == task_id).first()
     if not task:
         raise ValueError(f"Task {task_id} not found")
 
@@ -1505,11 +1505,11 @@ def task_advance(request, task_id):
             "task": {...}
         }
     """
-    from app.services.director_service import DirectorService
+    from app.services.director_service import DirectorService, ADVANCE_TASK_LOAD_OPTIONS
 
     db = next(get_db())
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
+        task = db.query(Task).options(*ADVANCE_TASK_LOAD_OPTIONS).filter(Task.id == task_id).first()
         if not task:
             return JsonResponse({"error": "Task not found"}, status=404)
 
@@ -1564,6 +1564,8 @@ def task_start(request, task_id):
 
         director = DirectorService(db)
         success, message = director.start_task(task)
+        if success:
+            db.commit()
 
         db.refresh(task)
 
@@ -1595,11 +1597,11 @@ def task_loop_back(request, task_id):
             "task": {...}
         }
     """
-    from app.services.director_service import DirectorService
+    from app.services.director_service import DirectorService, ADVANCE_TASK_LOAD_OPTIONS
 
     db = next(get_db())
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
+        task = db.query(Task).options(*ADVANCE_TASK_LOAD_OPTIONS).filter(Task.id == task_id).first()
         if not task:
             return JsonResponse({"error": "Task not found"}, status=404)
 
@@ -1616,6 +1618,7 @@ def task_loop_back(request, task_id):
 
         director = DirectorService(db)
         success, message = director._loop_back_to_dev(task, report)
+        db.commit()
 
         db.refresh(task)
 
@@ -2916,6 +2919,11 @@ def tasks_auto_assign_dev(request):
 # Deployment Endpoints
 # =============================================================================
 
+def _job_queue_enabled() -> bool:
+    """Whether long-running work should go to the job queue workers."""
+    return os.getenv("JOB_QUEUE_ENABLED", "true").lower() == "true"
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def run_deploy(request, run_id):
@@ -2963,21 +2971,34 @@ def run_deploy(request, run_id):
         if error:
             return JsonResponse({"error": error}, status=400)
 
-        # Execute deployment in background
-        def execute_async():
-            from app.db import get_db
-            db_session = next(get_db())
-            try:
-                svc = DeploymentService(db_session)
-                svc.complete_deployment_flow(run_id, environment_id, approved_by)
-            finally:
-                db_session.close()
+        # Execute deployment on the job queue so the request returns immediately
+        job_id = None
+        if _job_queue_enabled():
+            from app.services.job_queue_service import JobQueueService
+            job = JobQueueService(db).enqueue_deployment(
+                deployment_id=deployment.id,
+                action="deploy",
+                project_id=run.project_id
+            )
+            job_id = job.id
+        else:
+            deployment_id = deployment.id
 
-        thread = threading.Thread(target=execute_async, daemon=True)
-        thread.start()
+            def execute_async():
+                from app.db import get_db
+                db_session = next(get_db())
+                try:
+                    svc = DeploymentService(db_session)
+                    svc.run_deployment_flow(deployment_id)
+                finally:
+                    db_session.close()
+
+            thread = threading.Thread(target=execute_async, daemon=True)
+            thread.start()
 
         return JsonResponse({
             "deployment": deployment.to_dict(),
+            "job_id": job_id,
             "message": "Deployment started",
             "status": "deploying"
         }, status=202)
@@ -3036,23 +3057,36 @@ def run_rollback(request, run_id):
         if error:
             return JsonResponse({"error": error}, status=400)
 
-        # Execute rollback in background
-        def execute_async():
-            from app.db import get_db
-            db_session = next(get_db())
-            try:
-                svc = DeploymentService(db_session)
-                success, output = svc.execute_deployment(rollback_deployment.id)
-                if success:
-                    svc.run_health_check(rollback_deployment.id)
-            finally:
-                db_session.close()
-
-        thread = threading.Thread(target=execute_async, daemon=True)
-        thread.start()
+        # Execute rollback on the job queue so the request returns immediately
+        job_id = None
+        if _job_queue_enabled():
+            from app.services.job_queue_service import JobQueueService
+            job = JobQueueService(db).enqueue_deployment(
+                deployment_id=rollback_deployment.id,
+                action="rollback",
+                project_id=run.project_id
+            )
+            job_id = job.id
+        else:
+            rollback_id = rollback_deployment.id
+
+            def execute_async():
+                from app.db import get_db
+                db_session = next(get_db())
+                try:
+                    svc = DeploymentService(db_session)
+                    success, output = svc.execute_deployment(rollback_id)
+                    if success:
+                        svc.run_health_check(rollback_id)
+                finally:
+                    db_session.close()
+
+            thread = threading.Thread(target=execute_async, daemon=True)
+            thread.start()
 
         return JsonResponse({
             "rollback": rollback_deployment.to_dict(),
+            "job_id": job_id,
             "message": "Rollback started",
             "status": "rolling_back"
         }, status=202)
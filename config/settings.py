@@ -92,6 +92,10 @@ DATABASES = {
     }
 }
 
+# Raise instead of lazy-loading relationships that hot paths (e.g. work_cycle
+# context building) are expected to eager-load. Off in production, on in tests.
+STRICT_LOADING = os.getenv('STRICT_LOADING', 'false').lower() == 'true'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -20,6 +20,8 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Configure Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Fail loudly on accidental lazy loads in eager-loaded code paths
+os.environ.setdefault('STRICT_LOADING', 'true')
 
 import django
 django.setup()
@@ -1,6 +1,6 @@
 """Tests for the deployment service."""
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from app.models.deployment_history import DeploymentHistory, DeploymentStatus
 from app.services.deployment_service import DeploymentService
 
@@ -79,6 +79,112 @@ def test_rollback_deployment_not_found(db_session):
     assert error == "Deployment not found"
 
 
+def test_start_deployment_rejects_concurrent_deploy(db_session, sample_project, sample_run):
+    """Test a second deployment to an environment that is still deploying is refused."""
+    from app.models.environment import Environment, EnvironmentType
+
+    environment = Environment(
+        project_id=sample_project.id,
+        name="Test Env",
+        env_type=EnvironmentType.TESTING,
+        deploy_command="echo 'deploy'"
+    )
+    db_session.add(environment)
+    db_session.commit()
+
+    service = DeploymentService(db_session)
+    first, error = service.start_deployment(
+        run_id=sample_run.id,
+        environment_id=environment.id
+    )
+    assert first is not None
+    assert error is None
+
+    second, error = service.start_deployment(
+        run_id=sample_run.id,
+        environment_id=environment.id
+    )
+    assert second is None
+    assert error == "A deployment to this environment is already in progress"
+
+
+@patch('app.services.deployment_service._stream_command')
+def test_execute_deployment_skips_record_failed_as_stale(mock_stream, db_session, sample_project, sample_run):
+    """Test a queued deployment marked stale before a worker claims it never runs."""
+    from datetime import datetime, timedelta, timezone
+    from app.models.environment import Environment, EnvironmentType
+
+    environment = Environment(
+        project_id=sample_project.id,
+        name="Test Env",
+        env_type=EnvironmentType.TESTING,
+        deploy_command="echo 'deploy'"
+    )
+    db_session.add(environment)
+    db_session.commit()
+
+    service = DeploymentService(db_session)
+    queued, _ = service.start_deployment(
+        run_id=sample_run.id,
+        environment_id=environment.id
+    )
+    queued.started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+
+    replacement, error = service.start_deployment(
+        run_id=sample_run.id,
+        environment_id=environment.id
+    )
+    assert error is None
+
+    success, output = service.execute_deployment(queued.id)
+    assert success is False
+    assert output == "Deployment is no longer in progress"
+    mock_stream.assert_not_called()
+
+    db_session.refresh(queued)
+    assert queued.status == DeploymentStatus.FAILED
+
+
+@patch('app.services.deployment_service._stream_command')
+def test_rollback_rejected_while_deploying(mock_stream, db_session, sample_project, sample_run):
+    """Test a rollback is refused while the environment has a deployment in progress."""
+    from app.models.environment import Environment, EnvironmentType
+
+    environment = Environment(
+        project_id=sample_project.id,
+        name="Test Env",
+        env_type=EnvironmentType.TESTING,
+        deploy_command="echo 'deploy'",
+        rollback_command="echo 'rollback'"
+    )
+    db_session.add(environment)
+    db_session.commit()
+    mock_stream.return_value = (0, "Deployment successful")
+
+    service = DeploymentService(db_session)
+    deployed, _ = service.start_deployment(run_id=sample_run.id, environment_id=environment.id)
+    service.execute_deployment(deployed.id)
+    deploying, _ = service.start_deployment(run_id=sample_run.id, environment_id=environment.id)
+
+    rollback, error = service.rollback(
+        deployment_id=deploying.id,
+        reason="Test",
+        target_deployment_id=deployed.id
+    )
+    assert rollback is None
+    assert error == "A deployment to this environment is already in progress"
+
+
+def test_run_deployment_flow_not_found(db_session):
+    """Test queued deployment flow with non-existent deployment."""
+    service = DeploymentService(db_session)
+    success, result = service.run_deployment_flow(9999)
+    assert success is False
+    assert result["final_status"] == "failed"
+    assert result["messages"] == ["Deployment not found"]
+
+
 def test_run_health_check_no_url(db_session, sample_project, sample_run):
     """Test health check when no URL is configured."""
     from app.models.environment import Environment, EnvironmentType
@@ -118,8 +224,8 @@ def test_deployment_status_enum():
     assert DeploymentStatus.ROLLED_BACK.value == "rolled_back"
 
 
-@patch('subprocess.run')
-def test_execute_deployment_success(mock_subprocess, db_session, sample_project, sample_run):
+@patch('app.services.deployment_service._stream_command')
+def test_execute_deployment_success(mock_stream, db_session, sample_project, sample_run):
     """Test successful deployment execution."""
     from app.models.environment import Environment, EnvironmentType
 
@@ -133,12 +239,8 @@ def test_execute_deployment_success(mock_subprocess, db_session, sample_project,
     db_session.add(environment)
     db_session.commit()
 
-    # Mock subprocess success
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = "Deployment successful"
-    mock_result.stderr = ""
-    mock_subprocess.return_value = mock_result
+    # Mock command success
+    mock_stream.return_value = (0, "Deployment successful")
 
     service = DeploymentService(db_session)
 
@@ -159,8 +261,8 @@ def test_execute_deployment_success(mock_subprocess, db_session, sample_project,
     assert deployment.status == DeploymentStatus.DEPLOYED
 
 
-@patch('subprocess.run')
-def test_execute_deployment_failure(mock_subprocess, db_session, sample_project, sample_run):
+@patch('app.services.deployment_service._stream_command')
+def test_execute_deployment_failure(mock_stream, db_session, sample_project, sample_run):
     """Test failed deployment execution."""
     from app.models.environment import Environment, EnvironmentType
 
@@ -174,12 +276,8 @@ def test_execute_deployment_failure(mock_subprocess, db_session, sample_project,
     db_session.add(environment)
     db_session.commit()
 
-    # Mock subprocess failure
-    mock_result = MagicMock()
-    mock_result.returncode = 1
-    mock_result.stdout = ""
-    mock_result.stderr = "Deployment failed"
-    mock_subprocess.return_value = mock_result
+    # Mock command failure
+    mock_stream.return_value = (1, "Deployment failed")
 
     service = DeploymentService(db_session)
 
@@ -228,3 +326,105 @@ def test_get_deployment_history(db_session, sample_project, sample_run):
     history = service.get_deployment_history(run_id=sample_run.id)
 
     assert len(history) == 3
+
+
+def test_parse_command_plain_uses_argv():
+    """Test plain commands are split into argv and skip the shell."""
+    from app.services.deployment_service import _parse_command
+
+    args, use_shell = _parse_command("pytest tests/e2e -v")
+    assert use_shell is False
+    assert args == ("pytest", "tests/e2e", "-v")
+
+    args, use_shell = _parse_command("echo 'deploy'")
+    assert use_shell is False
+    assert args == ("echo", "deploy")
+
+
+def test_parse_command_shell_syntax_uses_shell():
+    """Test commands needing shell syntax or builtins keep shell=True."""
+    from app.services.deployment_service import _parse_command
+
+    for command in ("docker-compose up -d && echo done", "exit 1", "DEBUG=1 pytest", "ls *.py"):
+        args, use_shell = _parse_command(command)
+        assert use_shell is True
+        assert args == command
+
+
+def test_stream_command_keeps_tail_and_writes_full_log(tmp_path):
+    """Test streamed output is capped in memory but fully logged to disk."""
+    from app.services import deployment_service
+
+    log_path = str(tmp_path / "deploy.log")
+    with patch.object(deployment_service, "OUTPUT_HEAD_CHARS", 6), \
+            patch.object(deployment_service, "OUTPUT_TAIL_CHARS", 12):
+        returncode, output = deployment_service._stream_command(
+            "for i in 1 2 3 4 5; do echo line$i; done",
+            True,
+            cwd=None,
+            timeout=30,
+            log_path=log_path
+        )
+
+    assert returncode == 0
+    assert output == "line1\n\n...[TRUNCATED 12 chars]...\nline4\nline5\n"
+    with open(log_path) as f:
+        assert f.read().count("line") == 5
+
+
+def test_stream_command_reports_missing_executable_like_shell(tmp_path):
+    """Test a missing executable run without a shell exits 127 like /bin/sh."""
+    from app.services.deployment_service import _stream_command
+
+    returncode, output = _stream_command(
+        ("definitely-not-a-command-xyz", "--flag"),
+        False,
+        cwd=None,
+        timeout=30,
+        log_path=str(tmp_path / "deploy.log")
+    )
+
+    assert returncode == 127
+    assert "definitely-not-a-command-xyz" in output
+
+
+def test_stream_command_stops_capture_for_backgrounded_child(tmp_path):
+    """Test a backgrounded child holding the pipe doesn't block or crash capture."""
+    from app.services.deployment_service import OUTPUT_DETACHED_MARKER, _stream_command
+
+    returncode, output = _stream_command(
+        "echo started; (sleep 10; echo late) & echo done",
+        True,
+        cwd=None,
+        timeout=60,
+        log_path=str(tmp_path / "deploy.log")
+    )
+
+    assert returncode == 0
+    assert output == "started\ndone\n" + OUTPUT_DETACHED_MARKER
+
+
+def test_cap_output_keeps_head_and_tail():
+    """Test oversized output keeps its head and tail with a truncation marker."""
+    from app.services.deployment_service import _cap_output
+
+    assert _cap_output("abcdefgh", head=4, tail=4) == "abcdefgh"
+    assert _cap_output("abcdefghij", head=4, tail=4) == "abcd\n...[TRUNCATED 2 chars]...\nghij"
+
+
+def test_render_rollback_command_matches_format():
+    """Test pre-parsed rollback templates render like str.format."""
+    from app.services.deployment_service import _render_rollback_command
+
+    values = {"commit_sha": "abc123", "version": "1.2", "previous_sha": "def456"}
+    for template in [
+        "git checkout {commit_sha}",
+        "deploy --from {previous_sha} --to {commit_sha} v{version}",
+        "echo '{{literal}}' {commit_sha}",
+        "tag {version:>6}",
+        "no placeholders",
+    ]:
+        assert _render_rollback_command(template, **values) == template.format(**values)
+
+    with pytest.raises(KeyError):
+        _render_rollback_command("deploy {unknown}", **values)
@@ -75,3 +75,40 @@ def test_parent_cannot_complete_with_incomplete_subtasks(db_session, sample_proj
 
     assert success is False
     assert "incomplete subtasks" in message
+
+
+def test_quality_subtasks_get_distinct_task_ids(db_session, sample_project, sample_run):
+    """Subtasks created in one transition should each get their own task_id."""
+    task = Task(
+        project_id=sample_project.id,
+        task_id="T300",
+        title="Parent Task",
+        status=TaskStatus.IN_PROGRESS,
+        pipeline_stage=TaskPipelineStage.PM
+    )
+    db_session.add(task)
+    db_session.commit()
+    db_session.refresh(task)
+
+    director = DirectorService(db_session)
+    director.advance_task(task)
+
+    subtasks = db_session.query(Task).filter(Task.parent_task_id == task.id).all()
+    assert len(subtasks) > 1
+    assert len({subtask.task_id for subtask in subtasks}) == len(subtasks)
+
+
+def test_load_quality_requirements_reloads_on_mtime_change(tmp_path):
+    """Cached requirements are reused until the file's mtime changes."""
+    from app.services.quality_requirements_service import load_quality_requirements
+
+    path = tmp_path / "qa_requirements.json"
+    path.write_text(json.dumps([{"key": "tdd"}]))
+    first = load_quality_requirements(str(path))
+    assert first == [{"key": "tdd"}]
+    assert load_quality_requirements(str(path)) is first
+
+    path.write_text(json.dumps([{"key": "dry"}]))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_quality_requirements(str(path)) == [{"key": "dry"}]
@@ -0,0 +1,68 @@
+"""Tests for the docs service parse cache."""
+import os
+
+from app.services import docs_service
+
+
+def _function_names(scan):
+    return [f["name"] for f in scan["functions"]]
+
+
+def test_parse_cache_reused_until_mtime_changes(tmp_path, monkeypatch):
+    """Unchanged files come from the parse cache; a new mtime re-parses."""
+    monkeypatch.setattr(docs_service, "PARSE_CACHE_DIR", str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    project.mkdir()
+    module = project / "module.py"
+    module.write_text("def foo():\n    pass\n")
+    service = docs_service.DocsService(str(project))
+
+    assert _function_names(service.scan_project()) == ["foo"]
+
+    real_collect = docs_service._collect_definitions
+    calls = []
+
+    def collect(path, rel_path):
+        calls.append(path)
+        return real_collect(path, rel_path)
+
+    monkeypatch.setattr(docs_service, "_collect_definitions", collect)
+    assert _function_names(service.scan_project()) == ["foo"]
+    assert calls == []
+
+    # Same size, so only the mtime tells the cache the file changed
+    module.write_text("def bar():\n    pass\n")
+    stat = os.stat(module)
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _function_names(service.scan_project()) == ["bar"]
+    assert calls == [str(module)]
+
+
+def test_parse_cache_version_bump_reparses(tmp_path, monkeypatch):
+    """Entries written by an older parser version are not reused."""
+    monkeypatch.setattr(docs_service, "PARSE_CACHE_DIR", str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "module.py").write_text("def foo():\n    pass\n")
+    service = docs_service.DocsService(str(project))
+    service.scan_project()
+
+    calls = []
+    monkeypatch.setattr(docs_service, "_collect_definitions", lambda path, rel_path: calls.append(path) or ([], [], []))
+    monkeypatch.setattr(docs_service, "PARSE_CACHE_VERSION", docs_service.PARSE_CACHE_VERSION + 1)
+    service.scan_project()
+    assert len(calls) == 1
+
+def test_sweep_parse_cache_drops_deleted_files(tmp_path, monkeypatch):
+    """Cache entries for deleted source files are removed by the sweep."""
+    monkeypatch.setattr(docs_service, "PARSE_CACHE_DIR", str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "keep.py").write_text("def keep():\n    pass\n")
+    gone = project / "gone.py"
+    gone.write_text("def gone():\n    pass\n")
+    docs_service.DocsService(str(project)).scan_project()
+
+    gone.unlink()
+    assert docs_service._sweep_parse_cache() == 1
+    assert len(os.listdir(tmp_path / "cache")) == 1
@@ -0,0 +1,24 @@
+"""Tests for shared git helpers."""
+from app.services.git_utils import read_git_head
+
+
+def test_read_git_head_resolves_loose_and_packed_refs(tmp_path):
+    """Test HEAD is resolved from .git files without forking git."""
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    loose_sha = "a" * 40
+    packed_sha = "b" * 40
+
+    (git_dir / "refs" / "heads" / "main").write_text(loose_sha + "\n")
+    assert read_git_head(str(tmp_path)) == loose_sha
+
+    # Ref moved into packed-refs (e.g. after `git gc`)
+    (git_dir / "refs" / "heads" / "main").unlink()
+    (git_dir / "packed-refs").write_text(f"# pack-refs with: peeled\n{packed_sha} refs/heads/main\n")
+    assert read_git_head(str(tmp_path)) == packed_sha
+
+
+def test_read_git_head_not_a_repo(tmp_path):
+    """Test non-repositories return None so callers can fall back to git."""
+    assert read_git_head(str(tmp_path)) is None
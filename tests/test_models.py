@@ -285,3 +285,36 @@ class TestAuditEvent:
         assert data["actor"] == "qa"
         assert data["action"] == "submit_report"
         assert "timestamp" in data
+
+    def test_audit_buffer_flush_writes_pending_events(self, db_session):
+        """Test buffered audit events are written together on flush."""
+        from sqlalchemy.orm import sessionmaker
+        from app.models.audit import AuditBuffer
+
+        action = f"buffered_{uuid.uuid4().hex[:8]}"
+        buffer = AuditBuffer(session_factory=sessionmaker(bind=db_session.get_bind()))
+        buffer.add("director", action, "task", 1, {"n": 1})
+        buffer.add("director", action, "task", 2)
+
+        assert buffer.flush() == 2
+        assert buffer.flush() == 0
+        assert db_session.query(AuditEvent).filter(AuditEvent.action == action).count() == 2
+
+    def test_audit_buffer_keeps_events_after_failed_write(self, db_session):
+        """Test events from a failed write are retried on the next flush."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.models.audit import AuditBuffer
+
+        # An empty database has no audit_events table, so the first write fails
+        unavailable = sessionmaker(bind=create_engine("sqlite://"))
+        available = sessionmaker(bind=db_session.get_bind())
+        factories = iter([unavailable, available])
+
+        action = f"retried_{uuid.uuid4().hex[:8]}"
+        buffer = AuditBuffer(session_factory=lambda: next(factories)())
+        buffer.add("director", action, "task", 1)
+
+        assert buffer.flush() == 0
+        assert buffer.flush() == 1
+        assert db_session.query(AuditEvent).filter(AuditEvent.action == action).count() == 1
@@ -25,6 +25,22 @@ class TestRunService:
         ).all()
         assert len(events) == 1
 
+    def test_create_runs_batch(self, db_session, sample_project):
+        """Test creating several runs at once keeps order and audits each run."""
+        service = RunService(db_session)
+        runs = service.create_runs(sample_project.id, ["Run A", "Run B", "Run C"])
+
+        assert [run.name for run in runs] == ["Run A", "Run B", "Run C"]
+        assert all(run.state == RunState.PM for run in runs)
+        assert len({run.id for run in runs}) == 3
+
+        events = db_session.query(AuditEvent).filter(
+            AuditEvent.entity_type == "run",
+            AuditEvent.entity_id.in_([run.id for run in runs]),
+            AuditEvent.action == "create"
+        ).all()
+        assert len(events) == 3
+
 
 class TestSubmitReport:
     """Tests for submitting agent reports."""
@@ -191,6 +191,39 @@ class TestTaskIsBlocked:
 
         assert t3.is_blocked(db_session) is True
 
+    def test_blocked_ids_matches_is_blocked_for_batch(self, db_session, sample_project):
+        """Task.blocked_ids() agrees with is_blocked() across a batch."""
+        t1 = Task(
+            project_id=sample_project.id,
+            task_id="T1",
+            title="First task",
+            status=TaskStatus.DONE
+        )
+        t2 = Task(
+            project_id=sample_project.id,
+            task_id="T2",
+            title="Second task",
+            status=TaskStatus.IN_PROGRESS
+        )
+        t3 = Task(
+            project_id=sample_project.id,
+            task_id="T3",
+            title="Third task",
+            blocked_by=["T1"]
+        )
+        t4 = Task(
+            project_id=sample_project.id,
+            task_id="T4",
+            title="Fourth task",
+            blocked_by=["T1", "T2"]
+        )
+        db_session.add_all([t1, t2, t3, t4])
+        db_session.commit()
+
+        tasks = [t1, t2, t3, t4]
+        assert Task.blocked_ids(db_session, tasks) == {t4.id}
+        assert {t.id for t in tasks if t.is_blocked(db_session)} == {t4.id}
+
 
 class TestTaskProjectLink:
     """Tests for Task.project_id field (link to project).
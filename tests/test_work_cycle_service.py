@@ -0,0 +1,120 @@
+"""Tests for work_cycle context and git caching."""
+import subprocess
+from datetime import timedelta
+
+from app.models import AgentReport, Task, TaskStatus
+from app.models.report import AgentRole, ReportStatus
+from app.services import work_cycle_service
+
+
+def _count_builds(monkeypatch):
+    """Record calls to the uncached context builder."""
+    calls = []
+    real_build = work_cycle_service._build_work_cycle_context
+
+    def build(*args):
+        calls.append(args)
+        return real_build(*args)
+
+    monkeypatch.setattr(work_cycle_service, "_CONTEXT_CACHE", {})
+    monkeypatch.setattr(work_cycle_service, "_build_work_cycle_context", build)
+    return calls
+
+
+def test_context_cache_reused_until_new_report(db_session, sample_run, monkeypatch):
+    """A cached context is reused until the run gets a new report."""
+    calls = _count_builds(monkeypatch)
+
+    first = work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    assert work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev") == first
+    assert len(calls) == 1
+
+    db_session.add(AgentReport(
+        run_id=sample_run.id,
+        role=AgentRole.QA,
+        status=ReportStatus.FAIL,
+        summary="Login test fails on empty password"
+    ))
+    db_session.commit()
+
+    fresh = work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    assert len(calls) == 2
+    assert "Login test fails on empty password" in fresh
+
+
+def test_context_cache_reused_until_task_changes(db_session, sample_run, monkeypatch):
+    """Starting or editing a project task rebuilds the context."""
+    calls = _count_builds(monkeypatch)
+    task = Task(project_id=sample_run.project_id, task_id="T001", title="Add login form")
+    db_session.add(task)
+    db_session.commit()
+
+    work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    assert len(calls) == 1
+
+    task.status = TaskStatus.IN_PROGRESS
+    # Set explicitly so the bump doesn't depend on clock resolution
+    task.updated_at = task.created_at + timedelta(seconds=1)
+    db_session.commit()
+
+    fresh = work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    assert len(calls) == 2
+    assert "Add login form" in fresh
+
+def test_context_cache_expires_after_ttl(db_session, sample_run, monkeypatch):
+    """Task state is not in the cache key, so entries expire after the TTL."""
+    calls = _count_builds(monkeypatch)
+    monkeypatch.setattr(work_cycle_service, "CONTEXT_CACHE_TTL_SECONDS", 0)
+
+    work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    assert len(calls) == 2
+
+
+def test_context_cache_keyed_by_role(db_session, sample_run, monkeypatch):
+    """Each role gets its own context."""
+    calls = _count_builds(monkeypatch)
+
+    dev = work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "dev")
+    qa = work_cycle_service.build_work_cycle_context(db_session, sample_run.id, "qa")
+    assert len(calls) == 2
+    assert dev != qa
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+def test_commits_reused_until_head_moves(tmp_path, monkeypatch):
+    """Commits are served by HEAD sha, without git, until HEAD moves."""
+    monkeypatch.setattr(work_cycle_service, "_GIT_CACHE", {})
+    monkeypatch.setattr(work_cycle_service, "_COMMITS_BY_HEAD", {})
+    # Bypass the short per-repo TTL so only the HEAD-keyed cache applies
+    monkeypatch.setattr(work_cycle_service, "GIT_CACHE_TTL_SECONDS", 0)
+    repo = str(tmp_path)
+    _git(repo, "init", "-q")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "First | commit")
+
+    first = work_cycle_service.get_recent_commits(repo)
+    assert [c["message"] for c in first] == ["First | commit"]
+
+    # Unmoved HEAD: served from the cache without running git log
+    real_run = subprocess.run
+
+    def no_git_log(args, *a, **kw):
+        assert args[:2] != ["git", "log"], "git log ran for an unmoved HEAD"
+        return real_run(args, *a, **kw)
+
+    monkeypatch.setattr(work_cycle_service.subprocess, "run", no_git_log)
+    assert work_cycle_service.get_recent_commits(repo) == first
+    monkeypatch.setattr(work_cycle_service.subprocess, "run", real_run)
+
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "Second commit")
+    moved = work_cycle_service.get_recent_commits(repo)
+    assert [c["message"] for c in moved] == ["Second commit", "First | commit"]
+    commits, _ = work_cycle_service.get_git_context(repo)
+    assert commits == moved